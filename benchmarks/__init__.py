@@ -0,0 +1,2 @@
+# Description:  Benchmark scripts for the HashMap implementations. Run them from the repository root as modules,
+# e.g. python -m benchmarks.miss_lookup
@@ -0,0 +1,74 @@
+# Description:  Long-running delete/insert churn on the open addressing HashMap. The map is filled with N keys, then
+# every round removes random live keys and inserts fresh ones in pairs, so the size stays constant while tombstones
+# pile up. After each round, live and never-inserted keys are looked up with stats enabled and the average and longest
+# probe lengths are reported next to the tombstone count, which shows the probes stay bounded over time.
+#
+# Usage:  python -m benchmarks.churn [--size N] [--rounds N] [--pairs N] [--lookups N]
+#         [--probing quadratic|robin_hood] [--function builtin_hash]
+
+import argparse
+import random
+
+import hash_map_oa
+from hash_functions import builtin_hash, fnv1a_64
+from include import hash_function_1, hash_function_2
+from map_stats import MapStats
+
+SEED = 20240101
+
+# the bundled hash functions cluster keys like 'key123', which lengthens probes before any churn, so the
+# built-in hash is the default
+FUNCTIONS = {'builtin_hash': builtin_hash, 'fnv1a_64': fnv1a_64,
+             'hash_function_1': hash_function_1, 'hash_function_2': hash_function_2}
+
+
+def probe_lengths(m: hash_map_oa.HashMap, keys: list) -> (float, int):
+    """
+    return the average and longest number of buckets visited by looking up keys
+    """
+    stats = m.enable_stats(MapStats())
+    for key in keys:
+        m.contains_key(key)
+    m.disable_stats()
+    return stats.average_probe_length(), max(stats.probe_lengths)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='HashMap delete/insert churn benchmark')
+    parser.add_argument('--size', type=int, default=10000, help='number of live keys')
+    parser.add_argument('--rounds', type=int, default=30, help='number of churn rounds')
+    parser.add_argument('--pairs', type=int, default=10000, help='remove/insert pairs per round')
+    parser.add_argument('--lookups', type=int, default=2000, help='hits and misses looked up after each round')
+    parser.add_argument('--probing', default=hash_map_oa.QUADRATIC, choices=(hash_map_oa.QUADRATIC,
+                                                                              hash_map_oa.ROBIN_HOOD))
+    parser.add_argument('--function', default='builtin_hash', choices=sorted(FUNCTIONS))
+    args = parser.parse_args()
+
+    rng = random.Random(SEED)
+    m = hash_map_oa.HashMap(11, FUNCTIONS[args.function], probing=args.probing)
+    live = ['key' + str(i) for i in range(args.size)]
+    for key in live:
+        m.put(key, None)
+    missing = ['miss' + str(i) for i in range(args.lookups)]
+    nextKey = args.size
+
+    print(f"{'round':>6}{'pairs':>10}{'capacity':>10}{'tombstones':>12}{'fill':>7}"
+          f"{'hit avg':>9}{'hit max':>9}{'miss avg':>10}{'miss max':>10}")
+    for r in range(args.rounds + 1):
+        if r:
+            for _ in range(args.pairs):
+                slot = rng.randrange(len(live))
+                m.remove(live[slot])
+                live[slot] = 'key' + str(nextKey)
+                nextKey += 1
+                m.put(live[slot], None)
+
+        hitAvg, hitMax = probe_lengths(m, rng.sample(live, min(args.lookups, len(live))))
+        missAvg, missMax = probe_lengths(m, missing)
+        occupancy = m.occupancy_stats()
+        print(f"{r:>6}{r * args.pairs:>10}{occupancy['capacity']:>10}{occupancy['tombstones']:>12}"
+              f"{occupancy['fill']:>7.2f}{hitAvg:>9.2f}{hitMax:>9}{missAvg:>10.2f}{missMax:>10}")
+
+
+if __name__ == "__main__":
+    main()
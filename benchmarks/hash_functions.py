@@ -0,0 +1,92 @@
+# Description:  Compares the bundled and hash_functions.py hash functions: hashing throughput, and the probe lengths
+# and chain lengths they produce once the same keys are loaded into the open addressing and separate chaining HashMaps.
+#
+# Usage:  python -m benchmarks.hash_functions [--size N]
+
+import argparse
+import time
+
+import hash_functions
+import hash_map_oa
+import hash_map_sc
+from include import hash_function_1, hash_function_2
+
+
+def throughput(function, keys: list) -> float:
+    """
+    return keys hashed per second
+    """
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def oa_probe_lengths(m: hash_map_oa.HashMap) -> (float, int):
+    """
+    return the average and longest number of buckets a successful get visits in a quadratic probing map
+    """
+    m._finish_rehash()
+    buckets, capacity = m._buckets, m.get_capacity()
+    total, longest, count = 0, 0, 0
+    for i in range(capacity):
+        entry = buckets[i]
+        if entry is None or entry.is_tombstone:
+            continue
+        j = 0
+        while (entry.hash + j * j) % capacity != i:
+            j += 1
+        total += j + 1
+        longest = max(longest, j + 1)
+        count += 1
+    return total / max(count, 1), longest
+
+
+def sc_chain_lengths(m: hash_map_sc.HashMap) -> (float, int):
+    """
+    return the average length of the non-empty chains and the longest chain
+    """
+    total, longest, count = 0, 0, 0
+    for i in range(m.get_capacity()):
+        length = m._buckets[i].length()
+        if length:
+            total += length
+            longest = max(longest, length)
+            count += 1
+    return total / max(count, 1), longest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=10000, help='number of keys hashed and stored')
+    args = parser.parse_args()
+
+    keys = ['user' + str(i) for i in range(args.size)]
+    functions = (
+        hash_function_1,
+        hash_function_2,
+        hash_functions.fnv1a_32,
+        hash_functions.fnv1a_64,
+        hash_functions.siphash_function(),
+        hash_functions.builtin_hash,
+        hash_functions.hashlib_function('blake2b', b'benchmark-seed'),
+        hash_functions.hashlib_function('md5'),
+    )
+
+    print(f"{'function':<18}{'keys/s':>12}{'oa avg probe':>14}{'oa max':>8}{'sc avg chain':>14}{'sc max':>8}")
+    for function in functions:
+        rate = throughput(function, keys)
+
+        oa = hash_map_oa.HashMap(11, function)
+        sc = hash_map_sc.HashMap(11, function)
+        for key in keys:
+            oa.put(key, None)
+            sc.put(key, None)
+        probeAvg, probeMax = oa_probe_lengths(oa)
+        chainAvg, chainMax = sc_chain_lengths(sc)
+
+        print(f"{function.__name__:<18}{rate:>12.0f}{probeAvg:>14.2f}{probeMax:>8}{chainAvg:>14.2f}{chainMax:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Description:  Memory benchmark for the HashMaps. Loads N keys into each map and reports the traced bytes the map
+# holds per entry, not counting the key and value objects themselves, which are allocated before tracing starts.
+# The keys are hashed with the built-in hash so even 1M entries load quickly; the cuckoo map's second hash is the
+# built-in hash under a seed, so its two buckets stay independent.
+#
+# Usage:  python -m benchmarks.memory [--size 1000000] [--maps oa,sc]
+
+import argparse
+import gc
+import tracemalloc
+
+import hash_map_cuckoo
+import hash_map_oa
+import hash_map_oa_compact
+import hash_map_oa_flat
+import hash_map_sc
+from hash_functions import builtin_hash, seeded_builtin_hash
+
+MAPS = {
+    'oa': lambda: hash_map_oa.HashMap(11, builtin_hash),
+    'oa_robin_hood': lambda: hash_map_oa.HashMap(11, builtin_hash, probing=hash_map_oa.ROBIN_HOOD),
+    'oa_flat': lambda: hash_map_oa_flat.HashMap(11, builtin_hash),
+    'oa_compact': lambda: hash_map_oa_compact.HashMap(11, builtin_hash),
+    'sc': lambda: hash_map_sc.HashMap(11, builtin_hash),
+    'cuckoo': lambda: hash_map_cuckoo.HashMap(11, builtin_hash, function2=seeded_builtin_hash()),
+}
+
+
+def bytes_per_entry(make, keys: list) -> (float, float):
+    """
+    return the bytes a map retains per entry after loading keys, and the peak bytes per entry while loading
+    """
+    gc.collect()
+    tracemalloc.start()
+    m = make()
+    for key in keys:
+        m.put(key, key)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(keys), peak / len(keys)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='HashMap memory benchmark')
+    parser.add_argument('--size', type=int, default=1000000, help='number of entries loaded')
+    parser.add_argument('--maps', default='oa,sc', help='comma separated, any of ' + ','.join(MAPS))
+    args = parser.parse_args()
+
+    # the keys double as values and are allocated up front, so only the map's own structures are traced
+    keys = ['key' + str(i) for i in range(args.size)]
+
+    print(f"{'map':<16}{'entries':>10}{'bytes/entry':>13}{'peak bytes/entry':>18}")
+    for mapName in args.maps.split(','):
+        retained, peak = bytes_per_entry(MAPS[mapName], keys)
+        print(f"{mapName:<16}{args.size:>10}{retained:>13.1f}{peak:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
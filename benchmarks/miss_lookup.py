@@ -0,0 +1,64 @@
+# Description:  Compares miss-lookup latency of the open addressing, separate chaining and cuckoo HashMaps. Every map
+# is filled with the same keys and then probed with keys that were never inserted.
+#
+# Usage:  python -m benchmarks.miss_lookup [--size N] [--lookups N]
+
+import argparse
+import time
+
+import hash_map_cuckoo
+import hash_map_oa
+import hash_map_sc
+from include import hash_function_1, hash_function_2
+
+
+def percentile(sortedTimes: list, p: float) -> float:
+    """
+    return the p-th percentile of an already sorted list
+    """
+    return sortedTimes[min(len(sortedTimes) - 1, int(len(sortedTimes) * p))]
+
+
+def measure_misses(m, keys: list) -> list:
+    """
+    return sorted per-call contains_key latencies in nanoseconds for keys missing from m
+    """
+    clock = time.perf_counter_ns
+    times = []
+    for key in keys:
+        start = clock()
+        m.contains_key(key)
+        times.append(clock() - start)
+    times.sort()
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=10000, help='number of keys stored in each map')
+    parser.add_argument('--lookups', type=int, default=10000, help='number of missing keys looked up')
+    args = parser.parse_args()
+
+    present = ['user' + str(i) for i in range(args.size)]
+    missing = ['miss' + str(i) for i in range(args.lookups)]
+
+    print(f"{'map':<16}{'hash':<18}{'mean ns':>10}{'p50':>10}{'p99':>10}{'p99.9':>10}{'max':>12}")
+    for function in (hash_function_1, hash_function_2):
+        maps = (
+            ('oa quadratic', lambda: hash_map_oa.HashMap(11, function)),
+            ('oa robin hood', lambda: hash_map_oa.HashMap(11, function, probing=hash_map_oa.ROBIN_HOOD)),
+            ('sc', lambda: hash_map_sc.HashMap(11, function)),
+            ('cuckoo', lambda: hash_map_cuckoo.HashMap(11, function)),
+        )
+        for name, make in maps:
+            m = make()
+            for key in present:
+                m.put(key, None)
+            times = measure_misses(m, missing)
+            print(f"{name:<16}{function.__name__:<18}{sum(times) / len(times):>10.0f}"
+                  f"{percentile(times, 0.5):>10}{percentile(times, 0.99):>10}"
+                  f"{percentile(times, 0.999):>10}{times[-1]:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# Description:  Reproducible benchmark suite for the HashMaps. Runs put, get and contains_key hits and misses, remove,
+# delete/insert churn, resize_table, get_keys_and_values, iteration and find_mode over uniform and Zipfian key
+# distributions with both bundled hash functions. Reports ops/sec, latency percentiles and peak memory, and writes the
+# results as JSON so two commits can be compared.
+#
+# Usage:  python -m benchmarks.suite [--sizes 1000,10000] [--maps oa,sc] [--output results.json]
+#         python -m benchmarks.suite --compare before.json after.json
+
+import argparse
+import bisect
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+import capacity
+import hash_map_cuckoo
+import hash_map_oa
+import hash_map_oa_compact
+import hash_map_oa_flat
+import hash_map_sc
+from include import DynamicArray, hash_function_1, hash_function_2
+
+SEED = 20240101
+
+MAPS = {
+    'oa': lambda function: hash_map_oa.HashMap(11, function),
+    'oa_robin_hood': lambda function: hash_map_oa.HashMap(11, function, probing=hash_map_oa.ROBIN_HOOD),
+    'oa_incremental': lambda function: hash_map_oa.HashMap(11, function, incremental=True),
+    'oa_power_of_two': lambda function: hash_map_oa.HashMap(11, function, capacity_policy=capacity.POWER_OF_TWO),
+    'oa_flat': lambda function: hash_map_oa_flat.HashMap(11, function),
+    'oa_compact': lambda function: hash_map_oa_compact.HashMap(11, function),
+    'sc': lambda function: hash_map_sc.HashMap(11, function),
+    'sc_power_of_two': lambda function: hash_map_sc.HashMap(11, function, capacity_policy=capacity.POWER_OF_TWO),
+    'cuckoo': lambda function: hash_map_cuckoo.HashMap(11, function),
+}
+
+FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+}
+
+
+# ---------------------------- workloads ---------------------------- #
+
+def make_sampler(distribution: str, n: int, rnd: random.Random):
+    """
+    return a function drawing an index in range(n), uniformly or Zipf-distributed (s = 1.1)
+    """
+    if distribution == 'uniform':
+        return lambda: rnd.randrange(n)
+
+    cumulative = []
+    total = 0.0
+    for rank in range(1, n + 1):
+        total += 1 / rank ** 1.1
+        cumulative.append(total)
+    return lambda: bisect.bisect_left(cumulative, rnd.random() * total)
+
+
+def timed(operation, arguments: list) -> list:
+    """
+    call operation once per argument and return the sorted per-call latencies in nanoseconds
+    """
+    clock = time.perf_counter_ns
+    times = []
+    for argument in arguments:
+        start = clock()
+        operation(argument)
+        times.append(clock() - start)
+    times.sort()
+    return times
+
+
+def summarize(times: list) -> dict:
+    """
+    return ops/sec and latency percentiles for sorted per-call latencies
+    """
+    total = sum(times)
+
+    def percentile(p: float) -> int:
+        return times[min(len(times) - 1, int(len(times) * p))]
+
+    return {
+        'ops': len(times),
+        'seconds': total / 1e9,
+        'ops_per_sec': len(times) / (total / 1e9) if total else 0.0,
+        'p50_ns': percentile(0.5),
+        'p99_ns': percentile(0.99),
+        'p999_ns': percentile(0.999),
+        'max_ns': times[-1],
+    }
+
+
+def run_case(mapName: str, functionName: str, distribution: str, size: int) -> list:
+    """
+    run every workload for one map, hash function, key distribution and size
+    """
+    make = MAPS[mapName]
+    function = FUNCTIONS[functionName]
+    rnd = random.Random(SEED)
+    sample = make_sampler(distribution, size, rnd)
+
+    keys = ['key' + str(i) for i in range(size)]
+    missing = ['miss' + str(i) for i in range(size)]
+    lookups = [keys[sample()] for _ in range(size)]
+    mixed = [keys[sample()] if rnd.random() < 0.5 else missing[rnd.randrange(size)] for _ in range(size)]
+
+    results = {}
+    m = make(function)
+    results['put'] = timed(lambda key: m.put(key, key), keys)
+    results['get_hit'] = timed(m.get, lookups)
+    results['get_miss'] = timed(m.get, missing)
+    results['contains_key_50_50'] = timed(m.contains_key, mixed)
+    results['get_keys_and_values'] = timed(lambda _: m.get_keys_and_values(), [None])
+    if hasattr(m, 'items'):
+        results['iterate'] = timed(lambda _: [None for _ in m.items()], [None])
+    elif hasattr(m, '__iter__'):
+        results['iterate'] = timed(lambda _: [None for _ in m], [None])
+    results['resize_table'] = timed(m.resize_table, [m.get_capacity() * 2])
+
+    # delete churn: remove a sampled live key and insert a fresh one, keeping the size constant
+    live = list(keys)
+    churn = []
+    for i in range(size):
+        slot = sample()
+        churn.append((live[slot], 'new' + str(i)))
+        live[slot] = 'new' + str(i)
+    results['churn'] = timed(lambda pair: (m.remove(pair[0]), m.put(pair[1], None)), churn)
+    results['remove'] = timed(m.remove, live)
+
+    if mapName == 'sc':
+        da = DynamicArray([keys[sample()] for _ in range(size)])
+        results['find_mode'] = timed(lambda _: hash_map_sc.find_mode(da), [None])
+
+    peak = peak_memory(make, function, keys)
+
+    records = []
+    for workload, times in results.items():
+        record = {'map': mapName, 'function': functionName, 'distribution': distribution,
+                  'size': size, 'workload': workload}
+        record.update(summarize(times))
+        if workload == 'put':
+            record['peak_bytes'] = peak
+        records.append(record)
+    return records
+
+
+def peak_memory(make, function, keys: list) -> int:
+    """
+    return the peak traced allocation while loading keys into a fresh map
+    """
+    tracemalloc.start()
+    m = make(function)
+    for key in keys:
+        m.put(key, key)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+# ----------------------------- output ----------------------------- #
+
+def git_commit() -> str:
+    """
+    return the current commit hash, or an empty string outside a git checkout
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def record_key(record: dict) -> tuple:
+    """
+    return the fields identifying a benchmark case
+    """
+    return record['map'], record['function'], record['distribution'], record['size'], record['workload']
+
+
+def compare(beforePath: str, afterPath: str) -> None:
+    """
+    print the ops/sec and p99 change of every case present in both result files
+    """
+    with open(beforePath) as before, open(afterPath) as after:
+        old = {record_key(r): r for r in json.load(before)['results']}
+        new = {record_key(r): r for r in json.load(after)['results']}
+
+    print(f"{'case':<64}{'ops/s before':>14}{'after':>14}{'speedup':>9}{'p99 ratio':>11}")
+    for key in sorted(old.keys() & new.keys(), key=str):
+        a, b = old[key], new[key]
+        speedup = b['ops_per_sec'] / a['ops_per_sec'] if a['ops_per_sec'] else float('inf')
+        p99 = b['p99_ns'] / a['p99_ns'] if a['p99_ns'] else float('inf')
+        print(f"{'/'.join(map(str, key)):<64}{a['ops_per_sec']:>14.0f}{b['ops_per_sec']:>14.0f}"
+              f"{speedup:>9.2f}{p99:>11.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='HashMap benchmark suite')
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='comma separated key counts, e.g. 1000,10000,100000,1000000,10000000')
+    parser.add_argument('--maps', default='oa,sc', help='comma separated, any of ' + ','.join(MAPS))
+    parser.add_argument('--functions', default=','.join(FUNCTIONS))
+    parser.add_argument('--distributions', default='uniform,zipf')
+    parser.add_argument('--output', default=None, help='write JSON results to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    records = []
+    print(f"{'case':<64}{'ops/s':>12}{'p50 ns':>10}{'p99 ns':>10}{'p99.9 ns':>10}{'peak MB':>9}")
+    for size in [int(float(size)) for size in args.sizes.split(',')]:
+        for mapName in args.maps.split(','):
+            for functionName in args.functions.split(','):
+                for distribution in args.distributions.split(','):
+                    for record in run_case(mapName, functionName, distribution, size):
+                        records.append(record)
+                        peak = f"{record['peak_bytes'] / 2 ** 20:>9.1f}" if 'peak_bytes' in record else ''
+                        print(f"{'/'.join(map(str, record_key(record))):<64}{record['ops_per_sec']:>12.0f}"
+                              f"{record['p50_ns']:>10}{record['p99_ns']:>10}{record['p999_ns']:>10}{peak}")
+
+    if args.output:
+        with open(args.output, 'w') as out:
+            json.dump({'commit': git_commit(), 'python': platform.python_version(), 'seed': SEED,
+                       'results': records}, out, indent=1)
+
+
+if __name__ == "__main__":
+    main()
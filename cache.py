@@ -0,0 +1,282 @@
+# Description:  A bounded LRU cache with optional time-to-live, built on the open addressing or separate chaining
+# HashMap. The map stores one node per key, and the nodes are threaded on an intrusive doubly linked recency list, so
+# get, put, eviction and expiry are all O(1). The cache can be bounded by a maximum number of entries, by a maximum
+# total weight computed with a size function, or both. Expired entries are dropped lazily when they are accessed and
+# by a sweep that runs at most once per sweep_interval seconds. Hits, misses, evictions and expirations are counted.
+
+import time
+
+import hash_map_oa
+from hash_functions import builtin_hash
+
+
+class _CacheNode:
+    """
+    One cached key/value pair, linked into the recency list and, when entries expire, the expiry list
+    """
+
+    __slots__ = ('key', 'value', 'weight', 'expires', 'prev', 'next', 'older', 'newer')
+
+    def __init__(self, key: str = None, value: object = None, weight: int = 0, expires: float = None) -> None:
+        self.key = key
+        self.value = value
+        self.weight = weight
+        self.expires = expires
+
+        # recency list, most recently used next to the sentinel's next
+        self.prev = self.next = self
+        # expiry list in order of last write, which is expiry order since every entry has the same ttl
+        self.older = self.newer = self
+
+
+class LRUCache:
+    """
+    Least recently used cache with optional ttl, wrapping a HashMap
+    """
+
+    def __init__(self, max_entries: int = None, max_weight: int = None, size_function=None, ttl: float = None,
+                 sweep_interval: float = None, map=None, clock=time.monotonic) -> None:
+        """
+        Initialize an empty cache. max_entries and max_weight bound the number of entries and the sum of
+        size_function(value) over them (every value weighs 1 without a size function). Entries expire ttl
+        seconds after they were last put, and expired entries are swept at most every sweep_interval seconds
+        (every ttl seconds by default). map is the empty hash_map_oa or hash_map_sc HashMap to store the
+        entries in
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        if max_weight is not None and max_weight <= 0:
+            raise ValueError('max_weight must be positive')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be positive')
+
+        self._map = map if map is not None else hash_map_oa.HashMap(11, builtin_hash)
+        self._maxEntries = max_entries
+        self._maxWeight = max_weight
+        self._sizeFunction = size_function
+        self._ttl = ttl
+        self._clock = clock
+
+        self._sweepInterval = sweep_interval if sweep_interval is not None else ttl
+        self._nextSweep = clock() + self._sweepInterval if self._sweepInterval else None
+
+        # sentinel of both circular lists
+        self._head = _CacheNode()
+        self._weight = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_size(self) -> int:
+        """
+        Return the number of cached entries, including expired ones not dropped yet
+        """
+        return self._map.get_size()
+
+    def get_weight(self) -> int:
+        """
+        Return the total weight of the cached entries
+        """
+        return self._weight
+
+    # ------------------------------------------------------------------ #
+
+    def _link(self, node: _CacheNode) -> None:
+        """
+        method puts node at the most recently used end of the recency list
+        """
+        head = self._head
+        node.prev = head
+        node.next = head.next
+        head.next.prev = node
+        head.next = node
+
+    @staticmethod
+    def _unlink(node: _CacheNode) -> None:
+        """
+        method takes node out of the recency list
+        """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def _link_newest(self, node: _CacheNode) -> None:
+        """
+        method puts node at the newest end of the expiry list
+        """
+        head = self._head
+        node.newer = head
+        node.older = head.older
+        head.older.newer = node
+        head.older = node
+
+    @staticmethod
+    def _unlink_expiry(node: _CacheNode) -> None:
+        """
+        method takes node out of the expiry list
+        """
+        node.older.newer = node.newer
+        node.newer.older = node.older
+
+    def _drop(self, node: _CacheNode) -> None:
+        """
+        method removes node from the map and both lists
+        """
+        self._map.remove(node.key)
+        self._unlink(node)
+        if self._ttl is not None:
+            self._unlink_expiry(node)
+        self._weight -= node.weight
+
+    def _maybe_sweep(self, now: float) -> None:
+        """
+        method runs the periodic sweep when it is due
+        """
+        if self._nextSweep is not None and now >= self._nextSweep:
+            self._nextSweep = now + self._sweepInterval
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> int:
+        """
+        method drops every entry expired at now and returns how many were dropped. Only expired entries
+        are visited, since the expiry list is in expiry order
+        """
+        head = self._head
+        count = 0
+        node = head.newer
+        while node is not head and node.expires <= now:
+            nextNode = node.newer
+            self._drop(node)
+            count += 1
+            node = nextNode
+        self.expirations += count
+        return count
+
+    def sweep(self) -> int:
+        """
+        method drops every expired entry now and returns how many were dropped
+        """
+        if self._ttl is None:
+            return 0
+        return self._sweep(self._clock())
+
+    def _live_node(self, key: str, now: float) -> _CacheNode:
+        """
+        method returns the node for key, or None if key is missing or expired. An expired node is dropped
+        """
+        node = self._map.get(key)
+        if node is not None and node.expires is not None and node.expires <= now:
+            self._drop(node)
+            self.expirations += 1
+            return None
+        return node
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+        method returns the value cached for key and marks it most recently used, or returns default
+        """
+        now = self._clock() if self._ttl is not None else None
+        if now is not None:
+            self._maybe_sweep(now)
+        node = self._live_node(key, now)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if node.prev is not self._head:
+            self._unlink(node)
+            self._link(node)
+        return node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        method returns True if key is cached and not expired, without marking it used
+        """
+        now = self._clock() if self._ttl is not None else None
+        return self._live_node(key, now) is not None
+
+    def put(self, key: str, value: object) -> None:
+        """
+        method caches value for key as the most recently used entry, then evicts least recently used
+        entries until the cache is within its bounds
+        """
+        weight = self._sizeFunction(value) if self._sizeFunction is not None else 1
+        if self._maxWeight is not None and weight > self._maxWeight:
+            raise ValueError('value is heavier than max_weight')
+
+        now = None
+        if self._ttl is not None:
+            now = self._clock()
+            self._maybe_sweep(now)
+
+        # one probe finds the key's node or stores the new one
+        newNode = _CacheNode(key, value, weight)
+        node = self._map.setdefault(key, newNode)
+        if node is not newNode:
+            self._weight += weight - node.weight
+            node.value = value
+            node.weight = weight
+            self._unlink(node)
+            if now is not None:
+                self._unlink_expiry(node)
+        else:
+            self._weight += weight
+
+        self._link(node)
+        if now is not None:
+            node.expires = now + self._ttl
+            self._link_newest(node)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        method evicts least recently used entries while the cache is over max_entries or max_weight
+        """
+        head = self._head
+        while ((self._maxEntries is not None and self._map.get_size() > self._maxEntries)
+               or (self._maxWeight is not None and self._weight > self._maxWeight)):
+            self._drop(head.prev)
+            self.evictions += 1
+
+    def remove(self, key: str) -> None:
+        """
+        method removes key from the cache
+        """
+        node = self._map.get(key)
+        if node is not None:
+            self._drop(node)
+
+    def clear(self) -> None:
+        """
+        method removes every entry, keeping the stats
+        """
+        self._map.clear()
+        self._head = _CacheNode()
+        self._weight = 0
+
+    def keys(self):
+        """
+        method yields the cached keys from most to least recently used, expired ones included
+        """
+        head = self._head
+        node = head.next
+        while node is not head:
+            yield node.key
+            node = node.next
+
+    def get_stats(self) -> dict:
+        """
+        method returns the hit, miss, eviction and expiration counts, the hit rate, size and weight
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size': self.get_size(),
+            'weight': self._weight,
+        }
@@ -0,0 +1,75 @@
+# Description:  Capacity policies shared by the HashMaps. PRIME keeps the original prime capacities, which spread
+# even weak hash functions over the buckets through the modulo. POWER_OF_TWO sizes tables to powers of two so no
+# primality testing is needed on resize and an index is a bit mask; the hashes are then mixed with Fibonacci
+# (multiply-shift) hashing first, because the mask alone would only look at the low bits of a weak hash.
+# PRIME_LADDER lists the prime capacities the maps grow through, so growing and planning a capacity is a lookup
+# instead of a trial division search.
+
+from bisect import bisect_left
+
+PRIME = 'prime'
+POWER_OF_TWO = 'power_of_two'
+
+# primes roughly 1.3-1.6x apart up to 2^40. Every other entry is the smallest prime at least twice the one two
+# entries before it, starting at 11, so a map that starts at the default capacity of 11 and doubles lands on
+# the same capacities as with _next_prime(capacity * 2)
+PRIME_LADDER = (
+    2, 3, 5, 7, 11, 17, 23, 37, 47, 71, 97, 149, 197, 307, 397, 599, 797, 1201, 1597, 2399, 3203, 4813, 6421, 9631,
+    12853, 19289, 25717, 38593, 51437, 77167, 102877, 154321, 205759, 308639, 411527, 617293, 823117, 1234687,
+    1646237, 2469359, 3292489, 4938733, 6584983, 9877477, 13169977, 19754981, 26339969, 39509957, 52679969,
+    79019953, 105359939, 158039909, 210719881, 316079821, 421439783, 632159677, 842879579, 1264319377, 1685759167,
+    2528638781, 3371518343, 5057277539, 6743036717, 10114555091, 13486073473, 20229110281, 26972146961,
+    40458220463, 53944293929, 80916440903, 107888587883, 161832881863, 215777175787, 323665763693, 431554351609,
+    647331527417, 863108703229, 1294663054847, 1726217406467,
+)
+_LADDER_PRIMES = frozenset(PRIME_LADDER)
+
+# 2^64 / golden ratio, the multiplier of Fibonacci hashing
+_FIBONACCI = 0x9E3779B97F4A7C15
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def next_power_of_two(capacity: int) -> int:
+    """
+    return the smallest power of two that is at least capacity
+    """
+    return 1 << max(capacity - 1, 0).bit_length()
+
+
+def mix(hash: int) -> int:
+    """
+    return hash multiplied by the Fibonacci constant modulo 2^64, with the well mixed high half folded
+    into the low bits that a power-of-two mask keeps
+    """
+    hash = (hash * _FIBONACCI) & _MASK_64
+    return hash ^ (hash >> 32)
+
+
+def mixed(function):
+    """
+    return a hash function applying mix() to the hashes of function
+    """
+    def mixed_hash(key) -> int:
+        hash = (function(key) * _FIBONACCI) & _MASK_64
+        return hash ^ (hash >> 32)
+
+    mixed_hash.__name__ = 'mixed_' + getattr(function, '__name__', 'hash')
+    return mixed_hash
+
+
+
+def ladder_prime(capacity: int) -> int:
+    """
+    return the smallest prime of the ladder that is at least capacity, or None above the top of the ladder
+    """
+    index = bisect_left(PRIME_LADDER, capacity)
+    if index < len(PRIME_LADDER):
+        return PRIME_LADDER[index]
+    return None
+
+
+def is_ladder_prime(capacity: int) -> bool:
+    """
+    return True if capacity is on the prime ladder, which makes it known to be prime
+    """
+    return capacity in _LADDER_PRIMES
@@ -0,0 +1,231 @@
+# Description:  Measures how well a hash function spreads a corpus of keys over the bucket arrays of the HashMaps.
+# For each capacity it reports the bucket occupancy distribution, a chi-square uniformity score, the number of bucket
+# collisions, and the expected and actual longest chain (separate chaining) and probe sequence (open addressing with
+# quadratic probing). Keys are streamed once, so memory is bounded by the capacities analyzed, not by the number of
+# keys. Keys are assumed to be distinct.
+#
+# Usage:  python hash_analyzer.py KEYFILE [--function NAME] [--capacity N ...] [--min-capacity N --max-capacity N]
+#                                          [--json]
+
+import argparse
+import json
+import math
+from array import array
+
+import hash_functions
+import include
+from capacity import ladder_prime
+from hash_map_oa import HashMap
+
+
+def read_keys(path: str):
+    """
+    yield one key per line of a text file, without the line terminator
+    """
+    with open(path, encoding='utf-8') as keyFile:
+        for line in keyFile:
+            yield line.rstrip('\r\n')
+
+
+def prime_capacities(min_capacity: int, max_capacity: int) -> list:
+    """
+    return the capacities the HashMaps pass through when growing from min_capacity by doubling,
+    up to max_capacity. Like HashMap._capacity_for, each doubled capacity is rounded up to the prime
+    ladder, and to the next prime above the top of the ladder
+    """
+    capacities = []
+    capacity = _next_prime(min_capacity)
+    while capacity <= max_capacity:
+        capacities.append(capacity)
+        capacity = ladder_prime(capacity * 2) or _next_prime(capacity * 2)
+    return capacities
+
+
+def _next_prime(capacity: int) -> int:
+    """
+    return the prime HashMap._next_prime would pick for capacity
+    """
+    if capacity % 2 == 0:
+        capacity += 1
+    while not HashMap._is_prime(capacity):
+        capacity += 2
+    return capacity
+
+
+class _CapacityStats:
+    """
+    Running statistics for one capacity
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.counts = array('I', bytes(4 * capacity))
+
+        # open addressing simulation, only filled up to the 0.5 load at which the map would grow
+        self.occupied = bytearray(capacity)
+        self.oaKeys = 0
+        self.oaProbeTotal = 0
+        self.oaProbeMax = 0
+
+    def add(self, hash: int) -> None:
+        """record one key"""
+        capacity = self.capacity
+        self.counts[hash % capacity] += 1
+
+        if 2 * (self.oaKeys + 1) <= capacity:
+            occupied = self.occupied
+            j = 0
+            index = hash % capacity
+            while occupied[index]:
+                j += 1
+                index = (hash + j * j) % capacity
+            occupied[index] = 1
+            self.oaKeys += 1
+            self.oaProbeTotal += j + 1
+            self.oaProbeMax = max(self.oaProbeMax, j + 1)
+
+    def report(self, n: int) -> dict:
+        """summarize the keys recorded so far"""
+        capacity = self.capacity
+        counts = self.counts
+        load = n / capacity
+
+        distribution = {}
+        chiSquare = 0.0
+        for count in counts:
+            distribution[count] = distribution.get(count, 0) + 1
+            chiSquare += (count - load) ** 2
+        chiSquare = chiSquare / load if load else 0.0
+        occupiedBuckets = capacity - distribution.get(0, 0)
+
+        oaLoad = self.oaKeys / capacity
+        return {
+            'capacity': capacity,
+            'keys': n,
+            'load': load,
+            'occupancy': {str(k): distribution[k] for k in sorted(distribution)},
+            'expected_occupancy': {str(k): capacity * _poisson(load, k) for k in sorted(distribution)},
+            # ~1.0 for a uniform hash, much larger when keys cluster
+            'chi_square': chiSquare,
+            'chi_square_per_df': chiSquare / (capacity - 1) if capacity > 1 else 0.0,
+            'collisions': n - occupiedBuckets,
+            'sc_longest_chain': max(counts) if n else 0,
+            'sc_expected_longest_chain': _expected_longest_chain(n, capacity),
+            'oa_keys': self.oaKeys,
+            'oa_load': oaLoad,
+            'oa_average_probe': self.oaProbeTotal / self.oaKeys if self.oaKeys else 0.0,
+            'oa_expected_average_probe': _expected_average_probe(oaLoad),
+            'oa_longest_probe': self.oaProbeMax,
+            'oa_expected_longest_probe': _expected_longest_probe(self.oaKeys, capacity),
+        }
+
+
+def _poisson(load: float, k: int) -> float:
+    """probability that a bucket holds k keys when keys are spread uniformly"""
+    if load == 0:
+        return 1.0 if k == 0 else 0.0
+    return math.exp(k * math.log(load) - load - math.lgamma(k + 1))
+
+
+def _expected_longest_chain(n: int, capacity: int) -> int:
+    """smallest k for which fewer than half a bucket is expected to hold more than k keys"""
+    if n == 0:
+        return 0
+    load = n / capacity
+    k, tail = 0, 1.0
+    while True:
+        tail -= _poisson(load, k)
+        if capacity * tail < 0.5 or k >= n:
+            return k
+        k += 1
+
+
+def _expected_average_probe(load: float) -> float:
+    """expected buckets visited by a successful search under uniform hashing"""
+    if load == 0:
+        return 0.0
+    return math.log(1 / (1 - load)) / load
+
+
+def _expected_longest_probe(n: int, capacity: int) -> int:
+    """
+    smallest k for which fewer than half of n inserts are expected to need more than k probes.
+    The i-th insert needs more than k probes with probability (i / capacity) ** k, which sums to
+    about capacity * load ** (k + 1) / (k + 1)
+    """
+    if n == 0:
+        return 0
+    load = n / capacity
+    k = 1
+    while capacity * load ** (k + 1) / (k + 1) >= 0.5:
+        k += 1
+    return k
+
+
+def analyze(keys, function, capacities: list) -> list:
+    """
+    stream keys through function once and return one report per capacity
+    """
+    stats = [_CapacityStats(capacity) for capacity in capacities]
+    n = 0
+    for key in keys:
+        hash = function(key)
+        for capacityStats in stats:
+            capacityStats.add(hash)
+        n += 1
+    return [capacityStats.report(n) for capacityStats in stats]
+
+
+def resolve_function(name: str):
+    """
+    return the hash function called name from include or hash_functions
+    """
+    if name == 'siphash':
+        return hash_functions.siphash_function()
+    if name in ('blake2b', 'blake2s', 'md5', 'sha1', 'sha256'):
+        return hash_functions.hashlib_function(name)
+    for module in (include, hash_functions):
+        function = getattr(module, name, None)
+        if callable(function):
+            return function
+    raise ValueError('unknown hash function ' + name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Hash function quality analyzer')
+    parser.add_argument('keyfile', help='text file with one key per line')
+    parser.add_argument('--function', default='hash_function_2', help='hash function name')
+    parser.add_argument('--capacity', type=int, action='append', help='capacity to analyze, may be repeated')
+    parser.add_argument('--min-capacity', type=int, default=11)
+    parser.add_argument('--max-capacity', type=int, default=None,
+                        help='analyze every prime capacity the maps grow through up to this one')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    capacities = list(args.capacity or [])
+    if args.max_capacity:
+        capacities += prime_capacities(args.min_capacity, args.max_capacity)
+    if not capacities:
+        parser.error('give --capacity or --max-capacity')
+
+    reports = analyze(read_keys(args.keyfile), resolve_function(args.function), capacities)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+
+    for report in reports:
+        print(f"\ncapacity {report['capacity']}: {report['keys']} keys, load {report['load']:.3f}")
+        print(f"  chi-square {report['chi_square']:.1f} ({report['chi_square_per_df']:.3f} per degree of freedom)")
+        print(f"  bucket collisions {report['collisions']}")
+        print(f"  SC longest chain {report['sc_longest_chain']} (expected {report['sc_expected_longest_chain']})")
+        print(f"  OA over {report['oa_keys']} keys at load {report['oa_load']:.3f}: "
+              f"average probe {report['oa_average_probe']:.2f} (expected {report['oa_expected_average_probe']:.2f}), "
+              f"longest probe {report['oa_longest_probe']} (expected {report['oa_expected_longest_probe']})")
+        print('  occupancy  buckets  expected')
+        for k, buckets in report['occupancy'].items():
+            print(f"  {k:>9}  {buckets:>7}  {report['expected_occupancy'][k]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# Description:  Drop-in hash functions for the HashMaps. Every function has the same (key) -> int signature as
+# include.hash_function_1 and include.hash_function_2 and returns a non-negative integer. Includes FNV-1a, a keyed
+# SipHash-2-4 for keys that come from untrusted clients, and wrappers around the built-in hash and hashlib digests.
+# With NumPy installed, batch_function() returns vectorized versions of the bundled hash functions for batches of keys.
+
+import hashlib
+import os
+
+from include import hash_function_1, hash_function_2
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_MASK_32 = 0xFFFFFFFF
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def fnv1a_32(key: str) -> int:
+    """32-bit FNV-1a over the UTF-8 bytes of key"""
+    hash = 0x811C9DC5
+    for byte in key.encode():
+        hash = ((hash ^ byte) * 0x01000193) & _MASK_32
+    return hash
+
+
+def fnv1a_64(key: str) -> int:
+    """64-bit FNV-1a over the UTF-8 bytes of key"""
+    hash = 0xCBF29CE484222325
+    for byte in key.encode():
+        hash = ((hash ^ byte) * 0x100000001B3) & _MASK_64
+    return hash
+
+
+def builtin_hash(key: str) -> int:
+    """
+    The interpreter's built-in hash, folded to a non-negative 64-bit integer.
+    String hashes are keyed per process (see PYTHONHASHSEED), so values are
+    not stable across processes
+    """
+    return hash(key) & _MASK_64
+
+
+def seeded_builtin_hash(seed: int = None):
+    """
+    Return a hash function giving the built-in hash of (seed, key), folded to a
+    non-negative 64-bit integer. The tuple hash mixes the seed into every bit, so
+    hashes under different seeds, or under builtin_hash, are unrelated. A random
+    seed is drawn when it is omitted
+    """
+    if seed is None:
+        seed = int.from_bytes(os.urandom(8), 'little')
+
+    def seeded_hash(key: str) -> int:
+        """Built-in hash of key under the seed"""
+        return hash((seed, key)) & _MASK_64
+
+    return seeded_hash
+
+
+def _rotl(x: int, b: int) -> int:
+    """Rotate a 64-bit integer left by b bits"""
+    return ((x << b) | (x >> (64 - b))) & _MASK_64
+
+
+def siphash24(data: bytes, k0: int, k1: int) -> int:
+    """SipHash-2-4 of data under the 128-bit key (k0, k1), as a 64-bit integer"""
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    length = len(data)
+    end = length - length % 8
+    for start in range(0, end + 8, 8):
+        if start < end:
+            m = int.from_bytes(data[start:start + 8], 'little')
+        else:
+            # last block holds the remaining bytes and the message length
+            m = int.from_bytes(data[end:], 'little') | ((length & 0xFF) << 56)
+
+        v3 ^= m
+        for _ in range(2):
+            v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+        v0 ^= m
+
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def _sipround(v0: int, v1: int, v2: int, v3: int) -> tuple:
+    """One SipRound over the four 64-bit state words"""
+    v0 = (v0 + v1) & _MASK_64
+    v1 = _rotl(v1, 13) ^ v0
+    v0 = _rotl(v0, 32)
+    v2 = (v2 + v3) & _MASK_64
+    v3 = _rotl(v3, 16) ^ v2
+    v0 = (v0 + v3) & _MASK_64
+    v3 = _rotl(v3, 21) ^ v0
+    v2 = (v2 + v1) & _MASK_64
+    v1 = _rotl(v1, 17) ^ v2
+    v2 = _rotl(v2, 32)
+    return v0, v1, v2, v3
+
+
+def siphash_function(seed: bytes = None):
+    """
+    Return a keyed SipHash-2-4 hash function. seed is the 16-byte secret key;
+    a random one is generated when it is omitted. Without knowing the seed a
+    client cannot choose keys that collide, which prevents hash flooding
+    """
+    if seed is None:
+        seed = os.urandom(16)
+    if len(seed) != 16:
+        raise ValueError('seed must be 16 bytes')
+    k0 = int.from_bytes(seed[:8], 'little')
+    k1 = int.from_bytes(seed[8:], 'little')
+
+    def siphash(key: str) -> int:
+        """Keyed SipHash-2-4 over the UTF-8 bytes of key"""
+        return siphash24(key.encode(), k0, k1)
+
+    return siphash
+
+
+def hashlib_function(name: str = 'blake2b', seed: bytes = None):
+    """
+    Return a hash function built on a hashlib digest of the UTF-8 bytes of key,
+    truncated to 64 bits. For blake2b and blake2s the seed is used as the MAC
+    key, which makes a fast keyed hash; other algorithms prefix it to the data
+    """
+    if name in ('blake2b', 'blake2s'):
+        constructor = getattr(hashlib, name)
+        macKey = seed or b''
+
+        def digest_hash(key: str) -> int:
+            """Keyed BLAKE2 digest of key"""
+            return int.from_bytes(constructor(key.encode(), digest_size=8, key=macKey).digest(), 'little')
+    else:
+        prefix = seed or b''
+        hashlib.new(name)
+
+        def digest_hash(key: str) -> int:
+            """hashlib digest of key"""
+            return int.from_bytes(hashlib.new(name, prefix + key.encode()).digest()[:8], 'little')
+
+    digest_hash.__name__ = name
+    return digest_hash
+
+
+# --------------------------- batch hashing --------------------------- #
+
+# a key longer than this could overflow the 64-bit position-weighted sum, so its batch is hashed by the scalar function
+_BATCH_MAX_KEY_LENGTH = 1 << 20
+
+
+def _code_points(keys: list):
+    """
+    return the code points of all keys in one contiguous array, the start offset of every key and the key lengths
+    """
+    lengths = numpy.fromiter((len(key) for key in keys), dtype=numpy.int64, count=len(keys))
+    codes = numpy.frombuffer(''.join(keys).encode('utf-32-le'), dtype='<u4').astype(numpy.int64)
+    starts = numpy.zeros(len(keys), dtype=numpy.int64)
+    numpy.cumsum(lengths[:-1], out=starts[1:])
+    return codes, starts, lengths
+
+
+def _segment_sums(values, starts, lengths) -> list:
+    """
+    return the sum of values over every key's segment as a list of ints, 0 for empty keys
+    """
+    sums = numpy.zeros(len(starts), dtype=numpy.int64)
+    nonEmpty = lengths > 0
+    if values.size:
+        sums[nonEmpty] = numpy.add.reduceat(values, starts[nonEmpty])
+    return sums.tolist()
+
+
+def _scalar_batch(function, keys: list) -> list:
+    """
+    return function applied to every key
+    """
+    return [function(key) for key in keys]
+
+
+def hash_function_1_many(keys: list) -> list:
+    """
+    include.hash_function_1 of every key in keys, computed with NumPy as a segmented sum of code points
+    """
+    if not _vectorizable(keys):
+        return _scalar_batch(hash_function_1, keys)
+    try:
+        codes, starts, lengths = _code_points(keys)
+    except UnicodeEncodeError:
+        return _scalar_batch(hash_function_1, keys)
+    return _segment_sums(codes, starts, lengths)
+
+
+def hash_function_2_many(keys: list) -> list:
+    """
+    include.hash_function_2 of every key in keys, computed with NumPy as a segmented sum of code points
+    weighted by their 1-based position in the key
+    """
+    if not _vectorizable(keys):
+        return _scalar_batch(hash_function_2, keys)
+    try:
+        codes, starts, lengths = _code_points(keys)
+    except UnicodeEncodeError:
+        # lone surrogates have no UTF-32 encoding
+        return _scalar_batch(hash_function_2, keys)
+    positions = numpy.arange(1, codes.size + 1, dtype=numpy.int64) - numpy.repeat(starts, lengths)
+    return _segment_sums(codes * positions, starts, lengths)
+
+
+def _vectorizable(keys: list) -> bool:
+    """
+    return True if keys is a non-empty batch of strings NumPy can hash exactly
+    """
+    if numpy is None or not keys:
+        return False
+    for key in keys:
+        if type(key) is not str or len(key) > _BATCH_MAX_KEY_LENGTH:
+            return False
+    return True
+
+
+_BATCH_FUNCTIONS = {
+    hash_function_1: hash_function_1_many,
+    hash_function_2: hash_function_2_many,
+}
+
+
+def batch_function(function):
+    """
+    Return a function hashing a list of keys to a list of the same values as
+    function, vectorized when NumPy is installed and function has a batch
+    version, otherwise None
+    """
+    if numpy is None:
+        return None
+    return _BATCH_FUNCTIONS.get(function)
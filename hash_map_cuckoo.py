@@ -0,0 +1,377 @@
+# Description:  This is an implementation of a Hashmap using bucketized cuckoo hashing. Every key has exactly two
+# candidate buckets of bucket_size slots each, chosen by two independent hash functions, so a lookup touches at most
+# two buckets plus a small overflow stash. It includes the following functions: put(), get(), remove(), contains_key(),
+# clear(), empty_buckets(), resize_table(), table_load(), get_keys_and_values() and __iter__()
+
+from hash_functions import seeded_builtin_hash
+from include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+
+
+class HashException(Exception):
+    """
+    Custom exception for the cuckoo HashMap
+    """
+    pass
+
+
+# marks a free slot, keys themselves may be any hashable value
+_EMPTY = object()
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, function2=None, bucket_size: int = 4,
+                 stash_size: int = 4, max_kicks: int = 500, max_load: float = 0.9) -> None:
+        """
+        Initialize new HashMap that uses cuckoo hashing for collision resolution.
+        function picks a key's first bucket and function2 its second one, the two
+        should be independent of each other. By default function2 is the built-in
+        hash under a random seed, which is unrelated to any function, builtin_hash included
+        """
+        if bucket_size < 1 or stash_size < 0 or not 0 < max_load < 1:
+            raise HashException
+
+        self._hash_function = function
+        self._hash_function_2 = function2 if function2 is not None else seeded_builtin_hash()
+        self._bucketSize = bucket_size
+        self._stashSize = stash_size
+        self._maxKicks = max_kicks
+        self._maxLoad = max_load
+
+        # number of buckets must be a prime number
+        self._allocate(self._next_prime(max(1, -(-capacity // bucket_size))))
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        b = self._bucketSize
+        for i in range(self._numBuckets):
+            slots = []
+            for s in range(i * b, i * b + b):
+                if self._keys[s] is not _EMPTY:
+                    slots.append(str(HashEntry(self._keys[s], self._values[s], self._hashes1[s])))
+            out += str(i) + ': ' + str(slots) + '\n'
+        out += 'stash: ' + str([str(HashEntry(*entry[:3])) for entry in self._stash]) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the total number of slots across all buckets
+        """
+        return self._numBuckets * self._bucketSize
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, numBuckets: int) -> None:
+        """
+        method replaces the table with numBuckets empty buckets and an empty stash
+        """
+        slots = numBuckets * self._bucketSize
+        self._numBuckets = numBuckets
+        self._keys = [_EMPTY] * slots
+        self._values = [None] * slots
+        self._hashes1 = [0] * slots
+        self._hashes2 = [0] * slots
+        # [key, value, hash1, hash2] lists for entries that could not be placed in either of their buckets
+        self._stash = []
+        self._kickSlot = 0
+
+    def _find_slot(self, key: str, hash1: int, hash2: int) -> int:
+        """
+        method returns the slot holding key, or -1 if key is not in one of its two buckets
+        """
+        keys, b = self._keys, self._bucketSize
+        start = (hash1 % self._numBuckets) * b
+        hashes = self._hashes1
+        for s in range(start, start + b):
+            if hashes[s] == hash1 and keys[s] == key:
+                return s
+        start = (hash2 % self._numBuckets) * b
+        hashes = self._hashes2
+        for s in range(start, start + b):
+            if hashes[s] == hash2 and keys[s] == key:
+                return s
+        return -1
+
+    def _find_stash(self, key: str, hash1: int) -> int:
+        """
+        method returns the stash position holding key, or -1
+        """
+        for i in range(len(self._stash)):
+            entry = self._stash[i]
+            if entry[2] == hash1 and entry[0] == key:
+                return i
+        return -1
+
+    def _free_slot(self, bucket: int) -> int:
+        """
+        method returns a free slot in the given bucket, or -1 if the bucket is full
+        """
+        keys, b = self._keys, self._bucketSize
+        for s in range(bucket * b, bucket * b + b):
+            if keys[s] is _EMPTY:
+                return s
+        return -1
+
+    def _store(self, slot: int, key: str, value: object, hash1: int, hash2: int) -> None:
+        """
+        method writes an entry into a slot
+        """
+        self._keys[slot] = key
+        self._values[slot] = value
+        self._hashes1[slot] = hash1
+        self._hashes2[slot] = hash2
+
+    def _insert(self, key: str, value: object, hash1: int, hash2: int) -> bool:
+        """
+        method stores an entry whose key is known to be absent, evicting residents to their
+        alternate bucket when both candidate buckets are full. The entry left over after
+        max_kicks evictions goes to the stash. Returns False if the stash is full as well
+        """
+        n = self._numBuckets
+        bucket1, bucket2 = hash1 % n, hash2 % n
+        slot = self._free_slot(bucket1)
+        if slot < 0:
+            slot = self._free_slot(bucket2)
+        if slot >= 0:
+            self._store(slot, key, value, hash1, hash2)
+            return True
+
+        b = self._bucketSize
+        bucket = bucket1
+        for _ in range(self._maxKicks):
+            # evict a resident of the full bucket, rotating through its slots
+            self._kickSlot = (self._kickSlot + 1) % b
+            slot = bucket * b + self._kickSlot
+            victim = (self._keys[slot], self._values[slot], self._hashes1[slot], self._hashes2[slot])
+            self._store(slot, key, value, hash1, hash2)
+            key, value, hash1, hash2 = victim
+
+            # the evicted entry moves to whichever of its buckets it was not in
+            bucket = hash2 % n if hash1 % n == bucket else hash1 % n
+            slot = self._free_slot(bucket)
+            if slot >= 0:
+                self._store(slot, key, value, hash1, hash2)
+                return True
+
+        if len(self._stash) < self._stashSize:
+            self._stash.append([key, value, hash1, hash2])
+            return True
+
+        # put the homeless entry back so the caller can rehash everything
+        self._pending = (key, value, hash1, hash2)
+        return False
+
+    def _entries(self) -> list:
+        """
+        method returns (key, value, hash1, hash2) for every stored entry
+        """
+        out = []
+        keys = self._keys
+        for s in range(len(keys)):
+            if keys[s] is not _EMPTY:
+                out.append((keys[s], self._values[s], self._hashes1[s], self._hashes2[s]))
+        for entry in self._stash:
+            out.append(tuple(entry))
+        return out
+
+    def _rebuild(self, numBuckets: int, entries: list) -> None:
+        """
+        method reinserts entries into a table of numBuckets buckets, growing further until every
+        entry fits. Cached hashes are reused, keys are never rehashed
+        """
+        while True:
+            self._allocate(numBuckets)
+            for i in range(len(entries)):
+                if not self._insert(*entries[i]):
+                    break
+            else:
+                return
+
+            if numBuckets * self._bucketSize >= 8 * len(entries):
+                # a mostly empty table still overflows, so too many keys share both hashes and
+                # no capacity can separate them. Those keys can only live in a bigger stash
+                self._stashSize = self._stashSize * 2 + 1
+            else:
+                numBuckets = self._next_prime(numBuckets * 2)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        method updates the key/value pair in the hash map
+        """
+        hash1 = self._hash_function(key)
+        hash2 = self._hash_function_2(key)
+
+        slot = self._find_slot(key, hash1, hash2)
+        if slot >= 0:
+            self._values[slot] = value
+            return
+        index = self._find_stash(key, hash1)
+        if index >= 0:
+            self._stash[index][1] = value
+            return
+
+        # resize if required
+        if (self._size + 1) / self.get_capacity() > self._maxLoad:
+            self.resize_table(self.get_capacity() * 2)
+
+        if not self._insert(key, value, hash1, hash2):
+            entries = self._entries()
+            entries.append(self._pending)
+            self._rebuild(self._next_prime(self._numBuckets * 2), entries)
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        This method returns the current hash table load factor
+        """
+        return self._size / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of buckets with no entries in them
+        """
+        keys, b = self._keys, self._bucketSize
+        count = 0
+        for i in range(0, len(keys), b):
+            for s in range(i, i + b):
+                if keys[s] is not _EMPTY:
+                    break
+            else:
+                count += 1
+        return count
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        method changes the capacity of the internal hash table
+        """
+        numBuckets = self._next_prime(max(1, -(-new_capacity // self._bucketSize)))
+
+        # proceed if the new table can hold the elements stored below the max load
+        if numBuckets * self._bucketSize * self._maxLoad >= self._size:
+            self._rebuild(numBuckets, self._entries())
+
+    def get(self, key: str) -> object:
+        """
+        method returns the value associated with the given key
+        """
+        hash1 = self._hash_function(key)
+        slot = self._find_slot(key, hash1, self._hash_function_2(key))
+        if slot >= 0:
+            return self._values[slot]
+        if self._stash:
+            index = self._find_stash(key, hash1)
+            if index >= 0:
+                return self._stash[index][1]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        hash1 = self._hash_function(key)
+        if self._find_slot(key, hash1, self._hash_function_2(key)) >= 0:
+            return True
+        return bool(self._stash) and self._find_stash(key, hash1) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        method removes the given key and its associated value from the hash map
+        """
+        hash1 = self._hash_function(key)
+        slot = self._find_slot(key, hash1, self._hash_function_2(key))
+        if slot >= 0:
+            self._keys[slot] = _EMPTY
+            self._values[slot] = None
+            self._size -= 1
+            return
+        if self._stash:
+            index = self._find_stash(key, hash1)
+            if index >= 0:
+                self._stash.pop(index)
+                self._size -= 1
+
+    def clear(self) -> None:
+        """
+        method clears the contents of the hash map
+        """
+        self._allocate(self._numBuckets)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map
+        """
+        newArr = DynamicArray()
+        for key, value, _, _ in self._entries():
+            newArr.append((key, value))
+        return newArr
+
+    def __iter__(self):
+        """
+        method iterates across the hash map, yielding a HashEntry for each stored pair
+        """
+        for key, value, hash1, _ in self._entries():
+            yield HashEntry(key, value, hash1)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - contains_key example 1")
+    print("----------------------------")
+    m = HashMap(11, hash_function_1, hash_function_2)
+    m.put('key1', 10)
+    m.put('key2', 20)
+    m.put('key3', 30)
+    print(m.contains_key('key1'), m.contains_key('key4'), m.contains_key('key2'))
+    m.remove('key3')
+    print(m.contains_key('key3'))
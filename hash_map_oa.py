@@ -1,10 +1,16 @@
 # Description:  This is an implementation of a Hashmap using open addressing. It includes the following functions: put()
-# get(), remove(), contains_key(), clear(), empty_buckets(), resize_table(), table_load(), get_keys(), __iter__() and
-# __next__()
+# get(), remove(), contains_key(), clear(), empty_buckets(), resize_table(), table_load(), get_keys_and_values(),
+# keys(), values(), items() and __iter__(), a generator
 
 
+import time
+
 from include import (DynamicArray, DynamicArrayException, HashEntry,
                         hash_function_1, hash_function_2)
+from capacity import (POWER_OF_TWO, PRIME, is_ladder_prime, ladder_prime, mix, mixed,
+                      next_power_of_two)
+from hash_functions import batch_function
+from map_stats import MapStats
 
 class HashException(Exception):
     """
@@ -13,22 +19,90 @@ class HashException(Exception):
     """
     pass
 
+# placeholder left in the old table for entries already migrated by an incremental resize
+_MOVED = HashEntry(None, None)
+_MOVED.is_tombstone = True
+
+
+# collision resolution strategies
+QUADRATIC = 'quadratic'
+ROBIN_HOOD = 'robin_hood'
+
+
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, incremental: bool = False, rehash_step: int = 4,
+                 probing: str = QUADRATIC, max_load: float = None, capacity_policy: str = PRIME,
+                 min_load: float = None) -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        quadratic probing for collision resolution.
+        With incremental=True a resize moves rehash_step buckets per operation
+        instead of rebuilding the whole table inside a single put.
+        probing=ROBIN_HOOD selects linear Robin Hood probing with backward-shift
+        deletion, which leaves no tombstones and can run at a higher max_load;
+        its hashes are mixed like under POWER_OF_TWO.
+        capacity_policy=POWER_OF_TWO keeps power-of-two capacities, mixes the
+        hashes and replaces quadratic probing with triangular probing.
+        With min_load set, a remove that leaves the load below it shrinks the
+        table back to half the max load, but never below the initial capacity.
+        min_load must be at most a quarter of the max load, so a shrink is
+        never followed by an immediate grow or shrink
         """
+        if capacity_policy not in (PRIME, POWER_OF_TWO):
+            raise HashException
+        self._powerOfTwo = capacity_policy == POWER_OF_TWO
+
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number, or a power of two under the POWER_OF_TWO policy
+        self._capacity = self._round_capacity(capacity)
         for _ in range(self._capacity):
             self._buckets.append(None)
 
         self._hash_function = function
+        # vectorized version of function for the batch operations, None without NumPy
+        self._batchHash = batch_function(function)
         self._size = 0
+        self._tombstones = 0
+
+        # most buckets any entry of the current table was probed over when it was placed
+        self._longestProbe = 0
+
+        # incremental resize state, _oldBuckets is None unless a migration is in progress
+        self._incremental = incremental
+        # at least 2 buckets per step so a migration always completes before the next grow
+        self._rehashStep = max(rehash_step, 2)
+        self._oldBuckets = None
+        self._rehashIndex = 0
+        # live entries still in the old table, which count towards the size but not the current table's buckets
+        self._oldSize = 0
+
+        # quadratic probing only reaches every empty bucket while at most half the table is filled
+        if probing == QUADRATIC:
+            self._robinHood = False
+            self._maxLoad = 0.5 if max_load is None else min(max_load, 0.5)
+        elif probing == ROBIN_HOOD:
+            self._robinHood = True
+            self._maxLoad = 0.85 if max_load is None else min(max_load, 0.95)
+        else:
+            raise HashException
+
+        # the hash actually stored and probed with. It is mixed for power-of-two tables, whose mask only keeps the
+        # low bits, and for Robin Hood, whose linear probing merges the narrow bands of a weak hash into one cluster
+        self._mixHash = self._powerOfTwo or self._robinHood
+        self._keyHash = mixed(function) if self._mixHash else function
+
+        if min_load is not None and not 0 < min_load <= self._maxLoad / 4:
+            raise HashException
+        self._minLoad = min_load
+        self._minCapacity = self._capacity
+
+        # opt-in instrumentation, see enable_stats(). _probes holds the buckets visited by the last probe
+        self._stats = None
+        self._probes = 0
+
+        # bumped by every insert, removal, resize and clear so iterators can detect modification
+        self._version = 0
 
     def __str__(self) -> str:
         """
@@ -73,6 +147,25 @@ class HashMap:
 
         return True
 
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        method returns capacity if it is valid under the capacity policy, otherwise the next valid capacity
+        """
+        if self._powerOfTwo:
+            return next_power_of_two(capacity)
+        if is_ladder_prime(capacity) or self._is_prime(capacity):
+            return capacity
+        return self._next_prime(capacity)
+
+    def _capacity_for(self, capacity: int) -> int:
+        """
+        method returns the smallest capacity on the prime ladder (or power of two) that is at least capacity
+        """
+        if self._powerOfTwo:
+            return next_power_of_two(capacity)
+        prime = ladder_prime(capacity)
+        return prime if prime is not None else self._next_prime(capacity)
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -93,33 +186,85 @@ class HashMap:
         """
         method updates the key/value pair in the hash map
         """
-        # create hash entry object
-        entry = HashEntry(key, value)
+        self._entry_for(key, value).value = value
 
-        # resize if required
-        if self.table_load() >= 0.5:
-            newCapacity = self._next_prime(self.get_capacity() * 2)
-            self.resize_table(newCapacity)
-
-        m = self.get_capacity()
-        j = 0
-        probeInd = (self._hash_function(key)  + (j**2)) % m
-        isKey = None
-
-        # probe until key is found
-        while self._buckets[probeInd] != None and self._buckets[probeInd].is_tombstone is False and not isKey:
-            if self._buckets[probeInd].key == key:
-                self._buckets[probeInd] = entry
-                isKey = self._buckets[probeInd].key
+    def _entry_for(self, key: str, default: object) -> HashEntry:
+        """
+        method returns the live entry for key, first inserting one holding default if key is absent.
+        The key is hashed once and its probe sequence walked once
+        """
+        if self._oldBuckets is not None:
+            self._rehash_step()
+
+        # resize if required, tombstones count towards the fill since probes walk over them.
+        # When most of the fill is tombstones the table is rebuilt at the same capacity
+        if (self.get_size() + self._tombstones) / self.get_capacity() >= self._maxLoad:
+            if self.table_load() >= self._maxLoad / 2:
+                newCapacity = self._capacity_for(self.get_capacity() * 2)
             else:
-                probeInd = (self._hash_function(key)  + (j ** 2)) % m
-                j += 1
+                newCapacity = self.get_capacity()
+            if self._incremental:
+                self._start_rehash(newCapacity)
+            else:
+                self.resize_table(newCapacity)
 
-        # if key does not exist, add new entry
-        if not isKey:
-            self._buckets[probeInd] = entry
-            self._size += 1
+        # hash once, the probe sequence and the stored entry reuse it
+        return self._entry_for_hash(key, default, self._keyHash(key))
 
+    def _entry_for_hash(self, key: str, default: object, hash: int) -> HashEntry:
+        """
+        method returns the live entry for key given its hash, inserting one holding default if key
+        is absent. The caller is responsible for keeping the table below its maximum load
+        """
+        if self._robinHood:
+            entry = self._rh_entry_for(key, default, hash)
+            if self._stats is not None:
+                self._stats.record_put(self._probes)
+            return entry
+
+        m = self.get_capacity()
+        mask = m - 1 if self._powerOfTwo else 0
+        j = 0
+        probeInd = hash % m
+        freeInd = freeJ = -1
+
+        # probe until key or an empty bucket is found, remembering the first tombstone
+        entry = self._buckets[probeInd]
+        while entry is not None:
+            if entry.is_tombstone:
+                if freeInd < 0:
+                    freeInd, freeJ = probeInd, j
+            elif entry.hash == hash and entry.key == key:
+                if self._stats is not None:
+                    self._stats.record_put(j + 1)
+                return entry
+            j += 1
+            # triangular numbers visit every bucket of a power-of-two table
+            probeInd = (probeInd + j) & mask if mask else (hash + j * j) % m
+            entry = self._buckets[probeInd]
+
+        # while migrating, a key that has not moved yet is updated where it is
+        if self._oldSize:
+            entry = self._unmoved_entry(key, hash, j + 1)
+            if entry is not None:
+                if self._stats is not None:
+                    self._stats.record_put(self._probes)
+                return entry
+
+        # if key does not exist, add new entry, reusing the first tombstone on its probe path
+        if freeInd >= 0:
+            probeInd = freeInd
+            self._tombstones -= 1
+            self._longestProbe = max(self._longestProbe, freeJ + 1)
+        else:
+            self._longestProbe = max(self._longestProbe, j + 1)
+        entry = HashEntry(key, default, hash)
+        self._buckets[probeInd] = entry
+        self._size += 1
+        self._version += 1
+        if self._stats is not None:
+            self._stats.record_put(j + 1)
+        return entry
 
     def table_load(self) -> float:
         """
@@ -129,93 +274,542 @@ class HashMap:
 
     def empty_buckets(self) -> int:
         """
-        This method returns the number of empty buckets in the hash table
+        This method returns the number of empty buckets in the hash table. While a migration is in
+        progress, entries not moved yet are not in the table's buckets
         """
-        return self.get_capacity()-self.get_size()
+        return self.get_capacity()-self._occupied()
+
+    def _occupied(self) -> int:
+        """
+        method returns the number of buckets of the current table holding a live entry or a tombstone
+        """
+        return self.get_size()-self._oldSize+self._tombstones
+
+    def tombstone_count(self) -> int:
+        """
+        This method returns the number of buckets holding a removed entry
+        """
+        return self._tombstones
+
+    def occupancy_stats(self) -> dict:
+        """
+        This method returns the current size, capacity, load, bucket occupancy and longest probe in O(1).
+        longest_probe only grows between resizes, so after removals it is an upper bound. During a migration
+        size and load include the entries not moved yet, while the bucket counts cover the current table only
+        """
+        occupied = self._occupied()
+        return {
+            'size': self.get_size(),
+            'capacity': self.get_capacity(),
+            'load': self.table_load(),
+            'fill': occupied / self.get_capacity(),
+            'occupied_buckets': occupied,
+            'empty_buckets': self.empty_buckets(),
+            'tombstones': self._tombstones,
+            'longest_probe': self._longestProbe,
+        }
 
     def resize_table(self, new_capacity: int) -> None:
         """
         method changes the capacity of the internal hash table
         """
-        # check if new capacity is prime
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        if self._stats is None:
+            self._resize(new_capacity)
+            return
+
+        oldCapacity = self.get_capacity()
+        start = time.perf_counter()
+        self._resize(new_capacity)
+        self._stats.record_resize(time.perf_counter() - start, oldCapacity, self.get_capacity())
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        method rebuilds the table with the given capacity
+        """
+        # an explicit resize completes any migration in progress first
+        self._finish_rehash()
+
+        # check if new capacity is prime, or a power of two
+        new_capacity = self._round_capacity(new_capacity)
 
         # proceed if new capacity is larger than number of elements stored
         if new_capacity > self.get_size():
-            oldArr = self.get_keys_and_values()
-            self._buckets = DynamicArray()
-            self._capacity = new_capacity
-            self._size = 0
+            # keep the new table under the max load, as a probe may otherwise never reach a free bucket
+            while self.get_size() / new_capacity >= self._maxLoad:
+                new_capacity = self._capacity_for(new_capacity * 2)
 
-            for _ in range(self._capacity):
-                self._buckets.append(None)
+            oldBuckets = self._buckets
+            self._buckets = self._new_buckets(new_capacity)
+            self._capacity = new_capacity
+            self._tombstones = 0
+            self._longestProbe = 0
+            self._version += 1
 
-            for i in range(oldArr.length()):
-                self.put(oldArr[i][0], oldArr[i][1])
+            # live entries are moved as-is using their cached hash
+            for i in range(oldBuckets.length()):
+                entry = oldBuckets[i]
+                if entry is not None and entry.is_tombstone is False:
+                    self._place(entry, self._buckets)
 
+    @staticmethod
+    def _new_buckets(capacity: int) -> DynamicArray:
+        """
+        method returns a dynamic array of capacity empty buckets
+        """
+        return DynamicArray([None] * capacity)
 
-    def get(self, key: str) -> object:
+    def _start_rehash(self, new_capacity: int) -> None:
         """
-        method returns the value associated with the given key
+        method allocates a new table and starts migrating entries into it a few buckets at a time.
+        The old table stays readable until every bucket has been moved
+        """
+        self._finish_rehash()
+        start = time.perf_counter()
+        oldCapacity = self.get_capacity()
+        self._oldBuckets = self._buckets
+        self._buckets = self._new_buckets(new_capacity)
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._longestProbe = 0
+        self._rehashIndex = 0
+        self._oldSize = self.get_size()
+        self._version += 1
+        if self._stats is not None:
+            self._stats.record_resize(time.perf_counter() - start, oldCapacity, new_capacity)
+
+    def _rehash_step(self) -> None:
+        """
+        method migrates the next rehash_step buckets of the old table into the current one
+        """
+        oldBuckets = self._oldBuckets
+        oldCapacity = oldBuckets.length()
+        stop = min(self._rehashIndex + self._rehashStep, oldCapacity)
+        for i in range(self._rehashIndex, stop):
+            entry = oldBuckets[i]
+            if entry is not None and entry.is_tombstone is False:
+                self._place(entry, self._buckets)
+                # the slot must stay occupied so probes for unmoved keys don't stop here
+                oldBuckets[i] = _MOVED
+                self._oldSize -= 1
+        self._rehashIndex = stop
+
+        if stop == oldCapacity:
+            self._oldBuckets = None
+
+    def _finish_rehash(self) -> None:
         """
+        method migrates every remaining bucket of the old table, if a migration is in progress
+        """
+        while self._oldBuckets is not None:
+            self._rehash_step()
 
-        index = self._hash_function(key) % self.get_capacity()
-        m = self.get_capacity()
-        j = 0
-        if self._buckets[index] is not None:
-            while self._buckets[index]:
-                if self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-                    return self._buckets[index].value
-                index = (self._hash_function(key) + j ** 2) % m
+    def _place(self, entry: HashEntry, buckets: DynamicArray) -> None:
+        """
+        method stores an entry whose key is known to be absent from buckets
+        """
+        m = buckets.length()
+        if self._robinHood:
+            probes = self._rh_insert(entry, buckets, entry.hash % m, 0)
+        else:
+            # first empty bucket on the quadratic (or triangular) probe sequence
+            hash = entry.hash
+            mask = m - 1 if self._powerOfTwo else 0
+            j = 0
+            index = hash % m
+            while buckets[index] is not None:
                 j += 1
+                index = (index + j) & mask if mask else (hash + j * j) % m
+            buckets[index] = entry
+            probes = j + 1
 
-    def contains_key(self, key: str) -> bool:
+        if probes > self._longestProbe:
+            self._longestProbe = probes
+
+    def _find_index(self, key: str, hash: int, buckets: DynamicArray) -> int:
         """
-        method returns True if the given key is in the hash map, otherwise it returns False
+        method returns the index of the live entry for key in buckets, or -1 if key is not there
         """
-        index = self._hash_function(key) % self.get_capacity()
-        m = self.get_capacity()
+        if self._robinHood:
+            return self._rh_find_index(key, hash, buckets)
+
+        m = buckets.length()
+        mask = m - 1 if self._powerOfTwo else 0
         j = 0
-        if self._buckets[index] is not None:
-            while self._buckets[index]:
-                if self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-                    return True
-                index = (self._hash_function(key) + j**2) % m
-                j += 1
+        index = hash % m
+        entry = buckets[index]
+        while entry is not None and j < m:
+            if entry.is_tombstone is False and entry.hash == hash and entry.key == key:
+                self._probes = j + 1
+                return index
+            j += 1
+            index = (index + j) & mask if mask else (hash + j * j) % m
+            entry = buckets[index]
+        self._probes = j + 1
+        return -1
+
+    # ----------------------- Robin Hood probing ----------------------- #
 
-        return False
+    @staticmethod
+    def _rh_insert(entry: HashEntry, buckets: DynamicArray, index: int, dist: int) -> int:
+        """
+        method stores entry starting at index, where it is dist buckets from its home. Residents
+        closer to their home than the carried entry give up their bucket and are carried onwards.
+        Returns the probe length of the most displaced entry placed
+        """
+        m = buckets.length()
+        longest = 0
+        while True:
+            resident = buckets[index]
+            if resident is None:
+                buckets[index] = entry
+                return max(longest, dist + 1)
+            residentDist = (index - resident.hash) % m
+            if residentDist < dist:
+                buckets[index] = entry
+                longest = max(longest, dist + 1)
+                entry, dist = resident, residentDist
+            index += 1
+            if index == m:
+                index = 0
+            dist += 1
+
+    def _rh_find_index(self, key: str, hash: int, buckets: DynamicArray) -> int:
+        """
+        method returns the index of the live entry for key, or -1. The probe stops as soon as it
+        reaches a resident that is closer to its home than key would be at that bucket
+        """
+        m = buckets.length()
+        index = hash % m
+        dist = 0
+        entry = buckets[index]
+        while entry is not None and dist < m:
+            if entry.is_tombstone is False:
+                if entry.hash == hash and entry.key == key:
+                    self._probes = dist + 1
+                    return index
+                if (index - entry.hash) % m < dist:
+                    break
+            index += 1
+            if index == m:
+                index = 0
+            dist += 1
+            entry = buckets[index]
+        self._probes = dist + 1
+        return -1
+
+    def _unmoved_entry(self, key: str, hash: int, probes: int) -> HashEntry:
+        """
+        method returns the live entry for key in the old table of the migration in progress, or None.
+        probes is the number of buckets of the current table already walked without finding key
+        """
+        index = self._find_index(key, hash, self._oldBuckets)
+        if index < 0:
+            return None
+        self._probes += probes
+        return self._oldBuckets[index]
 
+    def _rh_entry_for(self, key: str, default: object, hash: int) -> HashEntry:
+        """
+        method returns the entry for key if present, otherwise inserts one holding default at the
+        first bucket where it is further from home than the resident
+        """
+        buckets = self._buckets
+        m = buckets.length()
+        index = hash % m
+        dist = 0
+        entry = buckets[index]
+        while entry is not None:
+            if entry.hash == hash and entry.key == key:
+                self._probes = dist + 1
+                return entry
+            if (index - entry.hash) % m < dist:
+                break
+            index += 1
+            if index == m:
+                index = 0
+            dist += 1
+            entry = buckets[index]
+
+        # while migrating, a key that has not moved yet is updated where it is
+        if self._oldSize:
+            entry = self._unmoved_entry(key, hash, dist + 1)
+            if entry is not None:
+                return entry
+
+        entry = HashEntry(key, default, hash)
+        longest = self._rh_insert(entry, buckets, index, dist)
+        if longest > self._longestProbe:
+            self._longestProbe = longest
+        self._size += 1
+        self._version += 1
+        self._probes = dist + 1
+        return entry
+
+    def _rh_delete(self, index: int) -> None:
+        """
+        method empties the bucket at index and shifts the following displaced entries back by one
+        so no tombstone is needed
+        """
+        buckets = self._buckets
+        m = buckets.length()
+        nextInd = index + 1 if index + 1 < m else 0
+        entry = buckets[nextInd]
+        while entry is not None and (nextInd - entry.hash) % m > 0:
+            buckets[index] = entry
+            index = nextInd
+            nextInd = index + 1 if index + 1 < m else 0
+            entry = buckets[nextInd]
+        buckets[index] = None
+
+    # ------------------------------------------------------------------ #
+
+    def _locate(self, key: str, hash: int = None) -> (DynamicArray, int):
+        """
+        method returns the table and index holding the live entry for key, checking the old table
+        while a migration is in progress. The index is -1 if key is not in the hash map
+        """
+        if self._oldBuckets is not None:
+            self._rehash_step()
+
+        if hash is None:
+            hash = self._keyHash(key)
+        index = self._find_index(key, hash, self._buckets)
+        if index < 0 and self._oldSize:
+            probes = self._probes
+            index = self._find_index(key, hash, self._oldBuckets)
+            self._probes += probes
+            return self._oldBuckets, index
+        return self._buckets, index
+
+    def get(self, key: str) -> object:
+        """
+        method returns the value associated with the given key
+        """
+        buckets, index = self._locate(key)
+        if self._stats is not None:
+            self._stats.record_get(index >= 0, self._probes)
+        if index >= 0:
+            return buckets[index].value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        index = self._locate(key)[1]
+        if self._stats is not None:
+            self._stats.record_get(index >= 0, self._probes)
+        return index >= 0
 
     def remove(self, key: str) -> None:
         """
         method removes the given key and its associated value from the hash map
         """
-        index = self._hash_function(key) % self.get_capacity()
-        m = self.get_capacity()
-        j = 0
-        if self._buckets[index] is not None:
-            while self._buckets[index]:
-                if self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-                    self._buckets[index].is_tombstone = True
-                    self._size -= 1
+        buckets, index = self._locate(key)
+        if self._stats is not None:
+            self._stats.record_remove(self._probes)
+        if index >= 0:
+            self._remove_at(buckets, index)
 
-                index = (self._hash_function(key) + j ** 2) % m
-                j += 1
+    def _remove_at(self, buckets: DynamicArray, index: int) -> None:
+        """
+        method removes the live entry at index of buckets
+        """
+        self._size -= 1
+        self._version += 1
+        if self._robinHood and buckets is self._buckets:
+            self._rh_delete(index)
+        else:
+            buckets[index].is_tombstone = True
+            # tombstones left in an old table being migrated are dropped with it
+            if buckets is self._buckets:
+                self._tombstones += 1
+            else:
+                self._oldSize -= 1
+
+        if self._minLoad is not None and self.table_load() < self._minLoad:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        """
+        method resizes a sparse table down to half the max load, but not below the initial capacity.
+        The load has to fall from there to min_load again before the next shrink, which keeps removes
+        amortized O(1)
+        """
+        newCapacity = self._capacity_for(max(int(self.get_size() / (self._maxLoad / 2)) + 1, self._minCapacity))
+        if newCapacity < self.get_capacity():
+            if self._incremental:
+                self._start_rehash(newCapacity)
+            else:
+                self.resize_table(newCapacity)
+
+    def upsert(self, key: str, fn, default: object = None) -> object:
+        """
+        method sets the value of key to fn(current value), where a missing key starts out as
+        default, and returns the new value. If fn raises, a missing key is left holding default
+        """
+        entry = self._entry_for(key, default)
+        entry.value = fn(entry.value)
+        return entry.value
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        method adds delta to the value of key, treating a missing key as 0, and returns the new value
+        """
+        entry = self._entry_for(key, 0)
+        entry.value += delta
+        return entry.value
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        method returns the value of key, first inserting default if key is missing
+        """
+        return self._entry_for(key, default).value
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        method removes key and returns its value, or returns default if key is missing
+        """
+        buckets, index = self._locate(key)
+        if self._stats is not None:
+            self._stats.record_remove(self._probes)
+        if index < 0:
+            return default
+        value = buckets[index].value
+        self._remove_at(buckets, index)
+        return value
+
+    # ------------------------------------------------------------------ #
+
+    def _hash_many(self, keys: list) -> list:
+        """
+        method returns the hash of every key in keys
+        """
+        if self._batchHash is not None:
+            hashes = self._batchHash(keys)
+            return [mix(hash) for hash in hashes] if self._mixHash else hashes
+        function = self._keyHash
+        return [function(key) for key in keys]
+
+    def _reserve_for(self, count: int) -> None:
+        """
+        method resizes the table once, if needed, so count more keys fit without another resize
+        """
+        self.reserve(self.get_size() + count)
+
+    def reserve(self, n: int, target_load: float = None) -> None:
+        """
+        method resizes the table once, if needed, so it holds n keys at no more than target_load
+        (by default the maximum load). Puts up to n keys never resize it, and min_load never
+        shrinks it below that size
+        """
+        self._finish_rehash()
+        load = self._maxLoad if target_load is None else min(target_load, self._maxLoad)
+        n = max(n, self.get_size())
+        needed = self._capacity_for(int(n / load) + 1)
+        if (n + self._tombstones) / self.get_capacity() >= load:
+            self.resize_table(max(needed, self.get_capacity()))
+        # shrinking never undoes a reservation
+        self._minCapacity = max(self._minCapacity, needed)
+
+    @classmethod
+    def with_expected_size(cls, n: int, function, target_load: float = None, **options) -> "HashMap":
+        """
+        method returns an empty HashMap sized once for n keys at no more than target_load. options are
+        passed to the constructor
+        """
+        map = cls(1, function, **options)
+        map.reserve(n, target_load)
+        return map
+
+    def put_many(self, pairs) -> None:
+        """
+        method puts every (key, value) pair of an iterable or mapping into the hash map. The table is
+        sized for all of them up front, so it is resized at most once
+        """
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        pairs = list(pairs)
+        self._reserve_for(len(pairs))
+        hashes = self._hash_many([pair[0] for pair in pairs])
+        for i in range(len(pairs)):
+            key, value = pairs[i]
+            self._entry_for_hash(key, value, hashes[i]).value = value
+
+    def get_many(self, keys) -> list:
+        """
+        method returns a list with the value of every key of an iterable, None for missing keys
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        values = []
+        for i in range(len(keys)):
+            buckets, index = self._locate(keys[i], hashes[i])
+            if self._stats is not None:
+                self._stats.record_get(index >= 0, self._probes)
+            values.append(buckets[index].value if index >= 0 else None)
+        return values
+
+    def contains_many(self, keys) -> list:
+        """
+        method returns a list with True for every key of an iterable that is in the hash map, otherwise False
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        found = []
+        for i in range(len(keys)):
+            index = self._locate(keys[i], hashes[i])[1]
+            if self._stats is not None:
+                self._stats.record_get(index >= 0, self._probes)
+            found.append(index >= 0)
+        return found
+
+    def remove_many(self, keys) -> None:
+        """
+        method removes every key of an iterable from the hash map
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        for i in range(len(keys)):
+            buckets, index = self._locate(keys[i], hashes[i])
+            if self._stats is not None:
+                self._stats.record_remove(self._probes)
+            if index >= 0:
+                self._remove_at(buckets, index)
+
+    def enable_stats(self, stats: MapStats = None) -> MapStats:
+        """
+        method starts recording operation counters, probe lengths and resize times into stats
+        (a new MapStats if omitted) and returns it
+        """
+        self._stats = stats if stats is not None else MapStats()
+        return self._stats
+
+    def disable_stats(self) -> None:
+        """
+        method stops recording stats
+        """
+        self._stats = None
+
+    def get_stats(self) -> MapStats:
+        """
+        method returns the attached MapStats, or None if stats are disabled
+        """
+        return self._stats
 
     def clear(self) -> None:
         """
         method clears the contents of the hash map
         """
-        curCapacity = self.get_capacity()
-        curFunction = self._hash_function
-        curSize = self.get_size()
-
-        for i in range(curCapacity):
+        self._oldBuckets = None
+        self._oldSize = 0
+        for i in range(self.get_capacity()):
             if self._buckets[i] is not None:
                 self._buckets[i] = None
 
         self._size = 0
+        self._tombstones = 0
+        self._longestProbe = 0
+        self._version += 1
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -224,52 +818,49 @@ class HashMap:
         """
 
         newArr = DynamicArray()
-        for i in range(self._buckets.length()):
-            if self._buckets[i] is not None:
-                if self._buckets[i].is_tombstone is False:
-                    newArr.append((self._buckets[i].key, self._buckets[i].value))
+        for item in self.items():
+            newArr.append(item)
 
         return newArr
 
-    def __iter__(self):
+    def _entries(self):
         """
-        method enables the hash map to iterate across itself
+        method yields the live entries, raising RuntimeError if the map is modified while iterating.
+        Any migration in progress is finished first, so each entry is seen exactly once
         """
-        self._index = 0
-        return self
-
-    def __next__(self):
+        self._finish_rehash()
+        version = self._version
+        buckets = self._buckets
+        for i in range(buckets.length()):
+            entry = buckets[i]
+            if entry is not None and entry.is_tombstone is False:
+                yield entry
+                if self._version != version:
+                    raise RuntimeError('HashMap changed during iteration')
+
+    def keys(self):
         """
-        method will return the next item in the hash map, based on the current location of the
-        iterator
+        method returns a new iterator over the keys in the hash map
         """
+        return (entry.key for entry in self._entries())
 
-        try:
-            if self._index < self._buckets.length():
-                while self._buckets[self._index] is None:
-                    self._index += 1
-                    if self._index >= self._buckets.length():
-                        raise StopIteration
-                if self._buckets[self._index] is not None:
-                    while self._buckets[self._index].is_tombstone is True:
-                        self._index += 1
-                        if self._index >= self._buckets.length():
-                            raise StopIteration
-                        while self._buckets[self._index] is None:
-                            self._index += 1
-                            if self._index >= self._buckets.length():
-                                raise StopIteration
-                    if self._buckets[self._index].is_tombstone is False:
-                        value = self._buckets[self._index]
-                        self._index += 1
-                        return value
-        except HashException:
-            raise StopIteration
-
-
-
+    def values(self):
+        """
+        method returns a new iterator over the values in the hash map
+        """
+        return (entry.value for entry in self._entries())
 
+    def items(self):
+        """
+        method returns a new iterator over the (key, value) pairs in the hash map
+        """
+        return ((entry.key, entry.value) for entry in self._entries())
 
+    def __iter__(self):
+        """
+        method returns a new iterator yielding a copy of the HashEntry of each key/value pair
+        """
+        return (HashEntry(entry.key, entry.value, entry.hash) for entry in self._entries())
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -461,7 +1052,18 @@ if __name__ == "__main__":
     m.resize_table(12)
     print(m.get_keys_and_values())"""
 
-    print("\nPDF - __iter__(), __next__() example 1")
+    print("\nresize_table(size + 1)")
+    print("----------------------")
+    for size in range(3, 41):
+        m = HashMap(11, hash_function_1)
+        for i in range(size):
+            m.put('key' + str(i), i)
+        m.resize_table(size + 1)
+        result = all(m.get('key' + str(i)) == i for i in range(size))
+        if not result or m.table_load() >= 0.5:
+            print(size, result, m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - __iter__() example 1")
     print("---------------------")
     m = HashMap(10, hash_function_1)
     for i in range(5):
@@ -471,7 +1073,7 @@ if __name__ == "__main__":
         print(item.key, item.value)
         #print('K:', item.key, 'V:', item.value)
 
-    print("\nPDF - __iter__(), __next__() example 2")
+    print("\nPDF - __iter__() example 2")
     print("---------------------")
     m = HashMap(10, hash_function_2)
     for i in range(5):
@@ -0,0 +1,363 @@
+# Description:  This is an implementation of a Hashmap using open addressing with a compact, insertion-ordered layout.
+# Entries are appended to dense parallel arrays (hashes, keys and values) in insertion order, and the probed table is
+# only a sparse index of small integers pointing into them, 8, 16, 32 or 64 bits wide depending on the capacity.
+# Iteration walks the dense arrays in insertion order without skipping empty slots, and a resize only rebuilds the
+# index. It has the same functions as hash_map_oa.HashMap: put(), get(), remove(), contains_key(), clear(),
+# empty_buckets(), resize_table(), table_load(), get_keys_and_values(), keys(), values(), items() and __iter__()
+
+from array import array
+
+from capacity import ladder_prime
+from include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+
+# index slot values, anything else is the position of an entry
+EMPTY = -1
+DUMMY = -2
+
+# hashes are stored in a signed 64-bit array, so they are masked to fit. A removed entry's hash is set to
+# _REMOVED until the next resize compacts the entries
+_HASH_MASK = (1 << 63) - 1
+_REMOVED = -1
+
+
+def _index_typecode(capacity: int) -> str:
+    """
+    return the narrowest signed array typecode that holds every entry position of a table of capacity slots
+    """
+    if capacity <= 0x7F:
+        return 'b'
+    if capacity <= 0x7FFF:
+        return 'h'
+    if capacity <= 0x7FFFFFFF and array('i').itemsize == 4:
+        return 'i'
+    return 'q'
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing over a compact index for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._index = self._new_index(self._capacity)
+
+        # dense entries in insertion order, including removed ones until the next resize
+        self._hashes = array('q')
+        self._keys = []
+        self._values = []
+
+        self._hash_function = function
+        self._size = 0
+
+        # bumped by every insert, removal, resize and clear so iterators can detect modification
+        self._version = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            slot = self._index[i]
+            if slot == EMPTY:
+                out += str(i) + ': None\n'
+            elif slot == DUMMY:
+                entry = HashEntry(None, None)
+                entry.is_tombstone = True
+                out += str(i) + ': ' + str(entry) + '\n'
+            else:
+                out += str(i) + ': ' + str(HashEntry(self._keys[slot], self._values[slot], self._hashes[slot])) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _new_index(capacity: int) -> array:
+        """
+        method returns an index of capacity empty slots in the narrowest integer type that fits
+        """
+        return array(_index_typecode(capacity), [EMPTY]) * capacity
+
+    def _hash(self, key: str) -> int:
+        """
+        method returns the hash of key, masked to fit in the hash array
+        """
+        return self._hash_function(key) & _HASH_MASK
+
+    def _find_slot(self, key: str, hash: int) -> int:
+        """
+        method returns the index slot pointing at the live entry for key, or -1 if key is not in the hash map
+        """
+        index, hashes, keys = self._index, self._hashes, self._keys
+        m = self._capacity
+        j = 0
+        slotInd = hash % m
+        slot = index[slotInd]
+        while slot != EMPTY and j < m:
+            if slot >= 0 and hashes[slot] == hash and keys[slot] == key:
+                return slotInd
+            j += 1
+            slotInd = (hash + j * j) % m
+            slot = index[slotInd]
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        method updates the key/value pair in the hash map
+        """
+        # every entry, removed or not, fills an index slot until the next resize. Resize when the fill reaches
+        # half the index, rebuilding at the same capacity when it is mostly removed entries
+        if len(self._keys) / self._capacity >= 0.5:
+            if self.table_load() >= 0.25:
+                newCapacity = ladder_prime(self._capacity * 2) or self._next_prime(self._capacity * 2)
+                self.resize_table(newCapacity)
+            else:
+                self.resize_table(self._capacity)
+
+        index, hashes, keys = self._index, self._hashes, self._keys
+        hash = self._hash(key)
+        m = self._capacity
+        j = 0
+        slotInd = hash % m
+
+        # probe until key or an empty slot is found; removed entries keep their slot as a DUMMY
+        slot = index[slotInd]
+        while slot != EMPTY:
+            if slot >= 0 and hashes[slot] == hash and keys[slot] == key:
+                self._values[slot] = value
+                return
+            j += 1
+            slotInd = (hash + j * j) % m
+            slot = index[slotInd]
+
+        # key does not exist, append a new entry
+        index[slotInd] = len(keys)
+        hashes.append(hash)
+        keys.append(key)
+        self._values.append(value)
+        self._size += 1
+        self._version += 1
+
+    def table_load(self) -> float:
+        """
+        This method returns the current hash table load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table
+        """
+        return self._capacity - len(self._keys)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        method changes the capacity of the internal hash table. Only the index is rebuilt; the entries
+        are compacted first if some were removed, and otherwise left untouched
+        """
+        # check if new capacity is prime
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        # proceed if new capacity is larger than number of elements stored
+        if new_capacity <= self._size:
+            return
+
+        if len(self._keys) != self._size:
+            self._compact()
+
+        # keep the index under half full, as a quadratic probe may otherwise never reach an empty slot
+        while self._size / new_capacity >= 0.5:
+            new_capacity = ladder_prime(new_capacity * 2) or self._next_prime(new_capacity * 2)
+
+        self._capacity = new_capacity
+        self._index = index = self._new_index(new_capacity)
+        hashes = self._hashes
+        m = new_capacity
+        for i in range(len(hashes)):
+            # place using the stored hash, the key is never rehashed
+            hash = hashes[i]
+            j = 0
+            slotInd = hash % m
+            while index[slotInd] != EMPTY:
+                j += 1
+                slotInd = (hash + j * j) % m
+            index[slotInd] = i
+        self._version += 1
+
+    def _compact(self) -> None:
+        """
+        method drops removed entries from the dense arrays, keeping the insertion order
+        """
+        hashes, keys, values = array('q'), [], []
+        oldHashes, oldKeys, oldValues = self._hashes, self._keys, self._values
+        for i in range(len(oldHashes)):
+            if oldHashes[i] != _REMOVED:
+                hashes.append(oldHashes[i])
+                keys.append(oldKeys[i])
+                values.append(oldValues[i])
+        self._hashes, self._keys, self._values = hashes, keys, values
+
+    def get(self, key: str) -> object:
+        """
+        method returns the value associated with the given key
+        """
+        slotInd = self._find_slot(key, self._hash(key))
+        if slotInd >= 0:
+            return self._values[self._index[slotInd]]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        return self._find_slot(key, self._hash(key)) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        method removes the given key and its associated value from the hash map
+        """
+        slotInd = self._find_slot(key, self._hash(key))
+        if slotInd >= 0:
+            slot = self._index[slotInd]
+            self._index[slotInd] = DUMMY
+            self._hashes[slot] = _REMOVED
+            # drop references so removed keys and values can be collected
+            self._keys[slot] = None
+            self._values[slot] = None
+            self._size -= 1
+            self._version += 1
+
+    def clear(self) -> None:
+        """
+        method clears the contents of the hash map
+        """
+        self._index = self._new_index(self._capacity)
+        self._hashes = array('q')
+        self._keys = []
+        self._values = []
+        self._size = 0
+        self._version += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map, in insertion order
+        """
+        newArr = DynamicArray()
+        for item in self.items():
+            newArr.append(item)
+        return newArr
+
+    def _positions(self):
+        """
+        method yields the position of every live entry in insertion order, raising RuntimeError if the
+        map is modified while iterating
+        """
+        version = self._version
+        hashes = self._hashes
+        for i in range(len(hashes)):
+            if hashes[i] != _REMOVED:
+                yield i
+                if self._version != version:
+                    raise RuntimeError('HashMap changed during iteration')
+
+    def keys(self):
+        """
+        method yields the keys in insertion order
+        """
+        keys = self._keys
+        for i in self._positions():
+            yield keys[i]
+
+    def values(self):
+        """
+        method yields the values in insertion order
+        """
+        values = self._values
+        for i in self._positions():
+            yield values[i]
+
+    def items(self):
+        """
+        method yields the (key, value) pairs in insertion order
+        """
+        keys, values = self._keys, self._values
+        for i in self._positions():
+            yield keys[i], values[i]
+
+    def __iter__(self):
+        """
+        method iterates across the hash map in insertion order, yielding a HashEntry for each key/value pair
+        """
+        hashes, keys, values = self._hashes, self._keys, self._values
+        for i in self._positions():
+            yield HashEntry(keys[i], values[i], hashes[i])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(50, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nInsertion order")
+    print("---------------")
+    m = HashMap(11, hash_function_2)
+    for key in ('banana', 'apple', 'cherry', 'date'):
+        m.put(key, len(key))
+    m.remove('apple')
+    m.put('apple', 5)
+    m.put('banana', 0)
+    print(list(m.items()))
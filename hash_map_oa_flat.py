@@ -0,0 +1,295 @@
+# Description:  This is an implementation of a Hashmap using open addressing that stores its table as parallel flat
+# arrays (hashes, keys, values and slot states) instead of one HashEntry object per slot. It has the same functions as
+# hash_map_oa.HashMap: put(), get(), remove(), contains_key(), clear(), empty_buckets(), resize_table(), table_load(),
+# get_keys_and_values() and __iter__()
+
+from array import array
+
+from include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+
+# slot states
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# hashes are stored in a signed 64-bit array, so they are masked to fit
+_HASH_MASK = (1 << 63) - 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                entry = HashEntry(self._keys[i], self._values[i], self._hashes[i])
+                entry.is_tombstone = self._states[i] == TOMBSTONE
+                out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        method replaces the table with empty flat arrays of the given capacity
+        """
+        self._hashes = array('q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    def _hash(self, key: str) -> int:
+        """
+        method returns the hash of key, masked to fit in the hash array
+        """
+        return self._hash_function(key) & _HASH_MASK
+
+    def _find_index(self, key: str, hash: int) -> int:
+        """
+        method returns the index of the live slot holding key, or -1 if key is not in the hash map
+        """
+        states, hashes, keys = self._states, self._hashes, self._keys
+        m = self._capacity
+        j = 0
+        index = hash % m
+        state = states[index]
+        while state != EMPTY and j < m:
+            if state == LIVE and hashes[index] == hash and keys[index] == key:
+                return index
+            j += 1
+            index = (hash + j * j) % m
+            state = states[index]
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        method updates the key/value pair in the hash map
+        """
+        # resize if required, rebuilding at the same capacity when the fill is mostly tombstones
+        if (self._size + self._tombstones) / self._capacity >= 0.5:
+            if self.table_load() >= 0.25:
+                self.resize_table(self._next_prime(self._capacity * 2))
+            else:
+                self.resize_table(self._capacity)
+
+        states, hashes, keys = self._states, self._hashes, self._keys
+        hash = self._hash(key)
+        m = self._capacity
+        j = 0
+        index = hash % m
+        freeInd = -1
+
+        # probe until key or an empty slot is found, remembering the first tombstone
+        state = states[index]
+        while state != EMPTY:
+            if state == LIVE:
+                if hashes[index] == hash and keys[index] == key:
+                    self._values[index] = value
+                    return
+            elif freeInd < 0:
+                freeInd = index
+            j += 1
+            index = (hash + j * j) % m
+            state = states[index]
+
+        if freeInd < 0:
+            freeInd = index
+        else:
+            self._tombstones -= 1
+
+        # key does not exist, add new entry
+        states[freeInd] = LIVE
+        hashes[freeInd] = hash
+        keys[freeInd] = key
+        self._values[freeInd] = value
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        This method returns the current hash table load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        method changes the capacity of the internal hash table
+        """
+        # check if new capacity is prime
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        # proceed if new capacity is larger than number of elements stored
+        if new_capacity <= self._size:
+            return
+
+        # keep the new table under half full, as a quadratic probe may otherwise never reach an empty slot
+        while self._size / new_capacity >= 0.5:
+            new_capacity = self._next_prime(new_capacity * 2)
+
+        oldStates, oldHashes = self._states, self._hashes
+        oldKeys, oldValues = self._keys, self._values
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        self._tombstones = 0
+
+        states, hashes, keys, values = self._states, self._hashes, self._keys, self._values
+        m = new_capacity
+        for i in range(len(oldStates)):
+            if oldStates[i] == LIVE:
+                # place using the stored hash, the key is never rehashed
+                hash = oldHashes[i]
+                j = 0
+                index = hash % m
+                while states[index] != EMPTY:
+                    j += 1
+                    index = (hash + j * j) % m
+                states[index] = LIVE
+                hashes[index] = hash
+                keys[index] = oldKeys[i]
+                values[index] = oldValues[i]
+
+    def get(self, key: str) -> object:
+        """
+        method returns the value associated with the given key
+        """
+        index = self._find_index(key, self._hash(key))
+        if index >= 0:
+            return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        return self._find_index(key, self._hash(key)) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        method removes the given key and its associated value from the hash map
+        """
+        index = self._find_index(key, self._hash(key))
+        if index >= 0:
+            self._states[index] = TOMBSTONE
+            # drop references so removed keys and values can be collected
+            self._keys[index] = None
+            self._values[index] = None
+            self._size -= 1
+            self._tombstones += 1
+
+    def clear(self) -> None:
+        """
+        method clears the contents of the hash map
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map
+        """
+        newArr = DynamicArray()
+        states, keys, values = self._states, self._keys, self._values
+        for i in range(self._capacity):
+            if states[i] == LIVE:
+                newArr.append((keys[i], values[i]))
+        return newArr
+
+    def __iter__(self):
+        """
+        method iterates across the hash map, yielding a HashEntry for each live slot
+        """
+        states = self._states
+        for i in range(self._capacity):
+            if states[i] == LIVE:
+                yield HashEntry(self._keys[i], self._values[i], self._hashes[i])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - __iter__() example 1")
+    print("---------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print(item)
@@ -1,29 +1,77 @@
 # Description:  This is an implementation of a Hashmap using singly linked lists. It includes the following functions: put()
 # get(), remove(), contains_key(), clear(), empty_buckets(), resize_table(), table_load(), get_keys() and a find_mode() function
 
-from include import (DynamicArray, LinkedList,
+import gc
+import math
+import multiprocessing
+import os
+import time
+from array import array
+
+from include import (DynamicArray, LinkedList, SLNode, SortedArrayBucket,
                         hash_function_1, hash_function_2)
+from capacity import (POWER_OF_TWO, PRIME, is_ladder_prime, ladder_prime, mix, mixed,
+                      next_power_of_two)
+from hash_functions import batch_function
+from map_stats import MapStats
+
+# a chain longer than this is converted to a SortedArrayBucket, and converted
+# back to a LinkedList once it shrinks to UNTREEIFY_THRESHOLD
+TREEIFY_THRESHOLD = 8
+UNTREEIFY_THRESHOLD = 6
+
+# every empty bucket of every map refers to this one list, so a bucket costs nothing until its first insert.
+# It is never inserted into: the map replaces it with a LinkedList of its own first
+_EMPTY_BUCKET = LinkedList()
+
+# find_mode_parallel counts inputs shorter than two chunks of this size in the calling process
+_PARALLEL_MIN_CHUNK = 50000
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 capacity_policy: str = PRIME,
+                 min_load: float = None) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        capacity_policy=POWER_OF_TWO keeps power-of-two capacities and mixes the hashes.
+        With min_load set, a remove that leaves the load below it shrinks the table
+        back to a load of 0.5, but never below the initial capacity. min_load must be
+        at most 0.25, so a shrink is never followed by an immediate grow or shrink
         """
-        self._buckets = DynamicArray()
+        if capacity_policy not in (PRIME, POWER_OF_TWO):
+            raise ValueError('unknown capacity policy ' + str(capacity_policy))
+        self._powerOfTwo = capacity_policy == POWER_OF_TWO
+
+        # capacity must be a prime number, or a power of two under the POWER_OF_TWO policy
+        self._capacity = self._round_capacity(capacity)
+        self._buckets = DynamicArray([_EMPTY_BUCKET] * self._capacity)
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        if min_load is not None and not 0 < min_load <= 0.25:
+            raise ValueError('min_load must be in (0, 0.25]')
+        self._minLoad = min_load
+        self._minCapacity = self._capacity
 
         self._hash_function = function
+        # the hash actually stored and indexed with, function mixed for power-of-two tables
+        self._keyHash = mixed(function) if self._powerOfTwo else function
+        # vectorized version of function for the batch operations, None without NumPy
+        self._batchHash = batch_function(function)
         self._size = 0
 
+        # opt-in instrumentation, see enable_stats()
+        self._stats = None
+
+        # _chainCounts[length] is the number of buckets holding that many nodes, kept up to date by every
+        # mutation so empty_buckets() and longest_chain() are O(1). Its last entry is always non-zero
+        self._chainCounts = [self._capacity]
+
+        # bumped by every insert, removal, resize and clear so iterators can detect modification
+        self._version = 0
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -67,6 +115,25 @@ class HashMap:
 
         return True
 
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        method returns capacity if it is valid under the capacity policy, otherwise the next valid capacity
+        """
+        if self._powerOfTwo:
+            return next_power_of_two(capacity)
+        if is_ladder_prime(capacity) or self._is_prime(capacity):
+            return capacity
+        return self._next_prime(capacity)
+
+    def _capacity_for(self, capacity: int) -> int:
+        """
+        method returns the smallest capacity on the prime ladder (or power of two) that is at least capacity
+        """
+        if self._powerOfTwo:
+            return next_power_of_two(capacity)
+        prime = ladder_prime(capacity)
+        return prime if prime is not None else self._next_prime(capacity)
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -87,35 +154,112 @@ class HashMap:
         """
         method updates the key/value pair in the hash map
         """
+        self._node_for(key, value).value = value
+
+    def _node_for(self, key: str, default: object) -> SLNode:
+        """
+        method returns the node for key, first inserting one holding default if key is absent.
+        The key is hashed once and its chain searched once
+        """
         if self.table_load() >= 1:
-            self.resize_table(self.get_capacity()*2)
+            self.resize_table(self._capacity_for(self.get_capacity()*2))
 
-        index = self._hash_function(key) % self.get_capacity()
+        return self._node_for_hash(key, default, self._keyHash(key))
+
+    def _node_for_hash(self, key: str, default: object, hash: int) -> SLNode:
+        """
+        method returns the node for key given its hash, inserting one holding default if key is absent.
+        The caller is responsible for resizing the table
+        """
+        index = hash % self.get_capacity()
 
-        sLlLength = self._buckets[index].length()
         sLList = self._buckets.get_at_index(index)
 
-        # if no nodes in list, insert key/value pair
-        if sLlLength == 0:
-            sLList.insert(key, value)
+        if self._stats is not None:
+            self._stats.record_put(sLList.length(), probe=False)
+
+        node = sLList.contains(key, hash)
+        if node is None:
+            if sLList is _EMPTY_BUCKET:
+                sLList = LinkedList()
+                self._buckets[index] = sLList
+            node = sLList.insert(key, default, hash)
             self._size += 1
-        # if key exists, replace value
-        elif sLList.contains(key):
-            sLList.remove(key)
-            sLList.insert(key, value)
+            self._version += 1
+            self._chain_grew(self._chainCounts, sLList.length())
+            if sLList.length() > TREEIFY_THRESHOLD and type(sLList) is LinkedList:
+                # the sorted bucket keeps the same node objects
+                self._buckets[index] = SortedArrayBucket(sLList)
+        return node
+
+    def upsert(self, key: str, fn, default: object = None) -> object:
+        """
+        method sets the value of key to fn(current value), where a missing key starts out as
+        default, and returns the new value. If fn raises, a missing key is left holding default
+        """
+        node = self._node_for(key, default)
+        node.value = fn(node.value)
+        return node.value
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        method adds delta to the value of key, treating a missing key as 0, and returns the new value
+        """
+        node = self._node_for(key, 0)
+        node.value += delta
+        return node.value
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        method returns the value of key, first inserting default if key is missing
+        """
+        return self._node_for(key, default).value
+
+    @staticmethod
+    def _chain_grew(chainCounts: list, length: int) -> None:
+        """
+        method moves one bucket from length - 1 to length in the chain length counts
+        """
+        chainCounts[length - 1] -= 1
+        if length == len(chainCounts):
+            chainCounts.append(1)
         else:
-            sLList.insert(key, value)
-            self._size += 1
+            chainCounts[length] += 1
+
+    def _chain_shrank(self, length: int) -> None:
+        """
+        method moves one bucket from length + 1 to length in the chain length counts
+        """
+        chainCounts = self._chainCounts
+        chainCounts[length + 1] -= 1
+        chainCounts[length] += 1
+        if length + 2 == len(chainCounts) and chainCounts[length + 1] == 0:
+            chainCounts.pop()
 
     def empty_buckets(self) -> int:
         """
         method returns the number of empty buckets in the hash table
         """
-        numEmptyBuckets = 0
-        for i in range(self._buckets.length()):
-            if self._buckets[i].length() == 0:
-                numEmptyBuckets += 1
-        return numEmptyBuckets
+        return self._chainCounts[0]
+
+    def longest_chain(self) -> int:
+        """
+        method returns the number of nodes in the longest bucket
+        """
+        return len(self._chainCounts) - 1
+
+    def occupancy_stats(self) -> dict:
+        """
+        method returns the current size, capacity, load, bucket occupancy and longest chain in O(1)
+        """
+        return {
+            'size': self.get_size(),
+            'capacity': self.get_capacity(),
+            'load': self.table_load(),
+            'occupied_buckets': self.get_capacity() - self._chainCounts[0],
+            'empty_buckets': self._chainCounts[0],
+            'longest_chain': len(self._chainCounts) - 1,
+        }
 
     def table_load(self) -> float:
         """
@@ -128,92 +272,248 @@ class HashMap:
         method clears the contents of the hash map
         """
         curCapacity = self.get_capacity()
-        curFunction = self._hash_function
-        curSize = self.get_size()
 
-        for i in range(curCapacity):
-            if self._buckets[i].length() > 0:
-                self._buckets[i] = LinkedList()
+        # swap in a fresh bucket array, the old chains are released with the old array
+        self._buckets = DynamicArray([_EMPTY_BUCKET] * curCapacity)
 
         self._size = 0
+        self._chainCounts = [curCapacity]
+        self._version += 1
 
 
     def resize_table(self, new_capacity: int) -> None:
         """
         method changes the capacity of the internal hash table
         """
+        if self._stats is None:
+            self._resize(new_capacity)
+            return
+
+        oldCapacity = self.get_capacity()
+        start = time.perf_counter()
+        self._resize(new_capacity)
+        self._stats.record_resize(time.perf_counter() - start, oldCapacity, self.get_capacity())
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        method rebuilds the buckets with the given capacity, doubling it until the load is at most 1
+        """
         if new_capacity >= 1:
-            if not self._is_prime(new_capacity):
-                new_capacity = self._next_prime(new_capacity)
+            new_capacity = self._round_capacity(new_capacity)
 
             old_capacity = self.get_capacity()
-            newArr = DynamicArray()
 
             newLoad = self.get_size() / new_capacity
 
             if newLoad > 1:
                 while newLoad > 1:
-                    new_capacity *= 2
-                    new_capacity = self._next_prime(new_capacity)
+                    new_capacity = self._capacity_for(new_capacity * 2)
                     newLoad = self.get_size() / new_capacity
 
-            for i in range(new_capacity):
-                newArr.append(LinkedList())
+            newArr = DynamicArray([_EMPTY_BUCKET] * new_capacity)
+            chainCounts = [new_capacity]
 
             for i in range(old_capacity):
                 bucket = self._buckets.pop()
                 for node in bucket:
-                    if bucket.length()>0:
-                        key = node.key
-                        value = node.value
-                        newIndex = self._hash_function(key) % new_capacity
-
-                        newArr[newIndex].insert(key, value)
+                    # reuse the cached hash instead of rehashing the key
+                    newIndex = node.hash % new_capacity
+                    newBucket = newArr[newIndex]
+                    if newBucket is _EMPTY_BUCKET:
+                        newBucket = LinkedList()
+                        newArr[newIndex] = newBucket
+                    newBucket.insert(node.key, node.value, node.hash)
+                    self._chain_grew(chainCounts, newBucket.length())
+                    if newBucket.length() > TREEIFY_THRESHOLD and type(newBucket) is LinkedList:
+                        newArr[newIndex] = SortedArrayBucket(newBucket)
 
 
             self._capacity = new_capacity
             self._buckets = newArr
+            self._chainCounts = chainCounts
+            self._version += 1
 
     def get(self, key: str):
         """
         method returns the value associated with the given key
         """
-
-        index = self._hash_function(key) % self.get_capacity()
-
-        if self._buckets[index].length() > 0:
-            cur = self._buckets[index].contains(key)
-            if cur:
-                for i in range(self._buckets[index].length()):
-                    if key == cur.key:
-                        return cur.value
-                    else:
-                        cur = cur.next
-
+        node = self._find(key, self._keyHash(key))
+        if node:
+            return node.value
 
     def contains_key(self, key: str) -> bool:
         """
         method returns True if the given key is in the hash map, otherwise it returns False
         """
-        index = self._hash_function(key) % self.get_capacity()
-        if self._buckets[index].length() != 0:
-            if self._buckets[index].contains(key):
-                return True
+        node = self._find(key, self._keyHash(key))
+        if node:
+            return True
         return False
 
+    def _find(self, key: str, hash: int) -> SLNode:
+        """
+        method returns the node for key given its hash, or None if key is not in the hash map
+        """
+        bucket = self._buckets[hash % self.get_capacity()]
+        node = bucket.contains(key, hash)
+        if self._stats is not None:
+            self._stats.record_get(node is not None, bucket.length(), probe=False)
+        return node
+
     def remove(self, key: str) -> None:
         """
         method removes the given key and its associated value from the hash map
         """
-        index = self._hash_function(key) % self.get_capacity()
-        if self._buckets[index].length() > 0:
-            for key_val in self._buckets[index]:
-                if key == key_val.key:
-                    self._buckets[index].remove(key)
-                    self._size -= 1
-                    return
+        self.pop(key)
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        method removes key and returns its value, or returns default if key is missing
+        """
+        return self._pop_hash(key, default, self._keyHash(key))
+
+    def _pop_hash(self, key: str, default: object, hash: int) -> object:
+        """
+        method removes key given its hash and returns its value, or returns default if key is missing
+        """
+        index = hash % self.get_capacity()
+        bucket = self._buckets[index]
+        if self._stats is not None:
+            self._stats.record_remove(bucket.length(), probe=False)
+        node = bucket.pop(key, hash)
+        if node is None:
+            return default
+        self._size -= 1
+        self._version += 1
+        self._chain_shrank(bucket.length())
+        if bucket.length() == 0:
+            self._buckets[index] = _EMPTY_BUCKET
+        elif bucket.length() <= UNTREEIFY_THRESHOLD and type(bucket) is SortedArrayBucket:
+            self._buckets[index] = self._untreeify(bucket)
+
+        if self._minLoad is not None and self.table_load() < self._minLoad:
+            self._shrink()
+        return node.value
+
+    def _shrink(self) -> None:
+        """
+        method resizes a sparse table down to a load of 0.5, but not below the initial capacity.
+        The load has to fall from there to min_load again before the next shrink, which keeps removes
+        amortized O(1)
+        """
+        newCapacity = self._capacity_for(max(2 * self.get_size() + 1, self._minCapacity))
+        if newCapacity < self.get_capacity():
+            self.resize_table(newCapacity)
+
+    # ------------------------------------------------------------------ #
+
+    def _hash_many(self, keys: list) -> list:
+        """
+        method returns the hash of every key in keys
+        """
+        if self._batchHash is not None:
+            hashes = self._batchHash(keys)
+            return [mix(hash) for hash in hashes] if self._powerOfTwo else hashes
+        function = self._keyHash
+        return [function(key) for key in keys]
+
+    def reserve(self, n: int, target_load: float = None) -> None:
+        """
+        method resizes the table once, if needed, so it holds n keys at no more than target_load
+        (by default 1). Puts up to n keys never resize it, and min_load never shrinks it below that size
+        """
+        load = 1 if target_load is None else min(target_load, 1)
+        needed = self._capacity_for(math.ceil(n / load))
+        if n > self.get_capacity() * load:
+            self.resize_table(needed)
+        # shrinking never undoes a reservation
+        self._minCapacity = max(self._minCapacity, needed)
+
+    @classmethod
+    def with_expected_size(cls, n: int, function: callable = hash_function_1, target_load: float = None,
+                           **options) -> "HashMap":
+        """
+        method returns an empty HashMap sized once for n keys at no more than target_load. options are
+        passed to the constructor
+        """
+        map = cls(1, function, **options)
+        map.reserve(n, target_load)
+        return map
+
+    def put_many(self, pairs) -> None:
+        """
+        method puts every (key, value) pair of an iterable or mapping into the hash map. The table is
+        sized for all of them up front, so it is resized at most once
+        """
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        pairs = list(pairs)
+        self.reserve(self.get_size() + len(pairs))
+        hashes = self._hash_many([pair[0] for pair in pairs])
+        for i in range(len(pairs)):
+            key, value = pairs[i]
+            self._node_for_hash(key, value, hashes[i]).value = value
+
+    def get_many(self, keys) -> list:
+        """
+        method returns a list with the value of every key of an iterable, None for missing keys
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        values = []
+        for i in range(len(keys)):
+            node = self._find(keys[i], hashes[i])
+            values.append(node.value if node is not None else None)
+        return values
+
+    def contains_many(self, keys) -> list:
+        """
+        method returns a list with True for every key of an iterable that is in the hash map, otherwise False
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        return [self._find(keys[i], hashes[i]) is not None for i in range(len(keys))]
+
+    def remove_many(self, keys) -> None:
+        """
+        method removes every key of an iterable from the hash map
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        for i in range(len(keys)):
+            self._pop_hash(keys[i], None, hashes[i])
+
+    @staticmethod
+    def _untreeify(bucket: SortedArrayBucket) -> LinkedList:
+        """
+        method converts a short sorted bucket back into a linked list
+        """
+        sLList = LinkedList()
+        for node in bucket:
+            sLList.insert(node.key, node.value, node.hash)
+        return sLList
 
 
+    def enable_stats(self, stats: MapStats = None) -> MapStats:
+        """
+        method starts recording operation counters, chain lengths and resize times into stats
+        (a new MapStats if omitted) and returns it
+        """
+        self._stats = stats if stats is not None else MapStats()
+        return self._stats
+
+    def disable_stats(self) -> None:
+        """
+        method stops recording stats
+        """
+        self._stats = None
+
+    def get_stats(self) -> MapStats:
+        """
+        method returns the attached MapStats, or None if stats are disabled
+        """
+        return self._stats
+
     def get_keys_and_values(self) -> DynamicArray:
         """
         method returns a dynamic array where each index contains a tuple of a key/value pair
@@ -221,12 +521,42 @@ class HashMap:
         """
 
         newArr = DynamicArray()
-        for i in range(self._buckets.length()):
-            if self._buckets[i].length() > 0:
-                for node in self._buckets.get_at_index(i):
-                    newArr.append((node.key, node.value))
+        for item in self.items():
+            newArr.append(item)
         return newArr
 
+    def _nodes(self):
+        """
+        method yields the nodes of every chain, raising RuntimeError if the map is modified while iterating
+        """
+        version = self._version
+        buckets = self._buckets
+        for i in range(buckets.length()):
+            bucket = buckets[i]
+            if bucket.length() > 0:
+                for node in bucket:
+                    yield node
+                    if self._version != version:
+                        raise RuntimeError('HashMap changed during iteration')
+
+    def keys(self):
+        """
+        method returns a new iterator over the keys in the hash map
+        """
+        return (node.key for node in self._nodes())
+
+    def values(self):
+        """
+        method returns a new iterator over the values in the hash map
+        """
+        return (node.value for node in self._nodes())
+
+    def items(self):
+        """
+        method returns a new iterator over the (key, value) pairs in the hash map
+        """
+        return ((node.key, node.value) for node in self._nodes())
+
 
 
 
@@ -240,15 +570,9 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     maxKey = DynamicArray()
     maxVal = 1
     for i in range(da.length()):
-        if map.contains_key(da[i]):
-            val = map.get(da[i])
-            val += 1
-            map.put(da[i], val)
-            if max(val, maxVal) >= maxVal:
-                if maxVal < val:
-                    maxVal = val
-        else:
-            map.put(da[i], 1)
+        val = map.increment(da[i])
+        if val > maxVal:
+            maxVal = val
 
     maxKeyVal = map.get_keys_and_values()
     for i in range(maxKeyVal.length()):
@@ -259,6 +583,123 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     return maxKey, maxVal
 
 
+# the input of find_mode_parallel in a worker process, set by the pool initializer
+_workerInput = None
+
+
+def _init_worker(da: DynamicArray) -> None:
+    """
+    store the input of find_mode_parallel in a pool worker. Forked workers inherit it instead of unpickling it
+    """
+    global _workerInput
+    _workerInput = da
+    # keep the garbage collector off the objects inherited from the parent, which it would otherwise walk
+    # on every full collection, copying their pages into the worker
+    gc.freeze()
+
+
+def _partition_chunk(start: int, end: int, capacity: int, partitions: int) -> list:
+    """
+    return the values of one chunk of the input split into partitions by bucket, for a table of capacity
+    buckets, each partition as a list of values and their hashes packed as 64-bit integers
+    """
+    parts = [([], array('q')) for _ in range(partitions)]
+    for i in range(start, end):
+        value = _workerInput[i]
+        hash = hash_function_1(value)
+        values, hashes = parts[hash % capacity % partitions]
+        values.append(value)
+        hashes.append(hash)
+    return [(values, hashes.tobytes()) for values, hashes in parts]
+
+
+def _count_partition(capacity: int, chunks: list) -> (int, list):
+    """
+    return the highest count in one partition and its modes as (bucket, rank, value) tuples, rank being
+    the position of the value in the traversal. chunks are the partition's pieces of every chunk in input
+    order, so each of its buckets receives the same values in the same order as in find_mode's map
+    """
+    # the table never resizes, as its capacity is at least the number of values
+    map = HashMap(capacity)
+    maxVal = 1
+    for values, packedHashes in chunks:
+        hashes = array('q')
+        hashes.frombytes(packedHashes)
+        for i in range(len(values)):
+            # the hash was computed while partitioning
+            node = map._node_for_hash(values[i], 0, hashes[i])
+            node.value += 1
+            if node.value > maxVal:
+                maxVal = node.value
+
+    modes = []
+    rank = 0
+    for node in map._nodes():
+        if node.value == maxVal:
+            modes.append((node.hash % capacity, rank, node.key))
+        rank += 1
+    return maxVal, modes
+
+
+def find_mode_parallel(da: DynamicArray, processes: int = None, chunk_size: int = None) -> (DynamicArray, int):
+    """
+    return the same tuple as find_mode using a pool of worker processes. Each worker splits one chunk of
+    da by bucket, then counts one partition of the buckets, so every value is counted by a single worker
+    and only the modes of each partition come back. Each partition is a set of buckets of a table the
+    size of find_mode's, so sorting the modes by bucket gives the order find_mode returns them in
+    """
+    processes = processes or os.cpu_count() or 1
+    n = da.length()
+    if processes == 1 or n < 2 * _PARALLEL_MIN_CHUNK:
+        return find_mode(da)
+
+    if chunk_size is None:
+        chunk_size = -(-n // processes)
+    capacity = HashMap(n).get_capacity()
+    bounds = [(start, min(start + chunk_size, n), capacity, processes) for start in range(0, n, chunk_size)]
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with context.Pool(processes, initializer=_init_worker, initargs=(da,)) as pool:
+        chunks = pool.starmap(_partition_chunk, bounds)
+        partials = pool.starmap(_count_partition,
+                                [(capacity, [parts[p] for parts in chunks]) for p in range(processes)])
+
+    maxVal = max(partialMax for partialMax, _ in partials)
+    modes = []
+    for partialMax, partialModes in partials:
+        if partialMax == maxVal:
+            modes.extend(partialModes)
+    # a bucket belongs to one partition, so (bucket, rank) pairs are unique and the values never compared
+    modes.sort()
+
+    maxKey = DynamicArray()
+    for _, _, value in modes:
+        maxKey.append(value)
+
+    return maxKey, maxVal
+
+
+def find_mode_stream(values) -> (DynamicArray, int):
+    """
+    return the same tuple as find_mode for any iterable or generator, reading it once. The modes are
+    collected as the counts grow, so the counts are never scanned a second time. An empty input
+    returns an empty array and 0
+    """
+    map = HashMap()
+    maxKey = DynamicArray()
+    maxVal = 0
+    for value in values:
+        val = map.increment(value)
+        if val > maxVal:
+            maxVal = val
+            maxKey = DynamicArray([value])
+        elif val == maxVal:
+            maxKey.append(value)
+
+    return maxKey, maxVal
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+# Description:  Bounded-memory heavy hitters for streams too large to count exactly. SpaceSaving keeps at most
+# capacity counters in a separate chaining HashMap and estimates the frequency of every frequent value to within
+# n / capacity, where n is the number of values seen. top_k() and find_mode_approx() read any iterable or generator
+# once. For an exact answer on streams whose distinct values fit in memory, use hash_map_sc.find_mode_stream().
+
+import heapq
+import math
+
+from hash_map_sc import HashMap
+from include import DynamicArray
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitter summary (Metwally, Agrawal and El Abbadi). Every value whose true count is above
+    n / capacity is guaranteed to hold a counter, and each counter overestimates its value by at most its error
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        """
+        Initialize an empty summary that keeps at most capacity counters
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self._capacity = capacity
+        self._total = 0
+
+        # value -> [count, error], where the true count lies in [count - error, count]
+        self._counters = HashMap(capacity)
+
+        # (count, sequence, value) min-heap over the counters. Increments push a new item and leave the old one
+        # behind, stale items are skipped when popped and dropped when the heap is rebuilt
+        self._heap = []
+        self._sequence = 0
+
+    @classmethod
+    def with_error(cls, epsilon: float) -> "SpaceSaving":
+        """
+        return a summary whose estimates are within epsilon * n of the true counts
+        """
+        if not 0 < epsilon <= 1:
+            raise ValueError('epsilon must be in (0, 1]')
+        return cls(math.ceil(1 / epsilon))
+
+    def get_capacity(self) -> int:
+        """
+        return the maximum number of counters kept
+        """
+        return self._capacity
+
+    def get_total(self) -> int:
+        """
+        return the number of values added so far
+        """
+        return self._total
+
+    def error_bound(self) -> float:
+        """
+        return the largest possible overestimate of any count, n / capacity
+        """
+        return self._total / self._capacity
+
+    def add(self, value: object, count: int = 1) -> None:
+        """
+        method records count more occurrences of value
+        """
+        self._total += count
+        counter = self._counters.get(value)
+        if counter is not None:
+            counter[0] += count
+        elif self._counters.get_size() < self._capacity:
+            counter = [count, 0]
+            self._counters.put(value, counter)
+        else:
+            # replace the smallest counter; the new value inherits its count as error
+            minimum = self._pop_minimum()
+            self._counters.remove(minimum[2])
+            counter = [minimum[0] + count, minimum[0]]
+            self._counters.put(value, counter)
+
+        self._push(counter[0], value)
+
+    def update(self, values) -> None:
+        """
+        method records one occurrence of every value of an iterable
+        """
+        for value in values:
+            self.add(value)
+
+    def _push(self, count: int, value: object) -> None:
+        """
+        method pushes a heap item for value, rebuilding the heap once stale items outnumber the counters
+        """
+        self._sequence += 1
+        heapq.heappush(self._heap, (count, self._sequence, value))
+        if len(self._heap) > 2 * self._capacity + 16:
+            self._heap = []
+            for value, counter in self._items():
+                self._sequence += 1
+                self._heap.append((counter[0], self._sequence, value))
+            heapq.heapify(self._heap)
+
+    def _pop_minimum(self) -> tuple:
+        """
+        method pops and returns the heap item of the smallest counter
+        """
+        while True:
+            item = heapq.heappop(self._heap)
+            counter = self._counters.get(item[2])
+            if counter is not None and counter[0] == item[0]:
+                return item
+
+    def _items(self) -> list:
+        """
+        return the (value, [count, error]) pairs of every counter
+        """
+        pairs = self._counters.get_keys_and_values()
+        return [pairs[i] for i in range(pairs.length())]
+
+    def estimate(self, value: object) -> int:
+        """
+        return the estimated count of value, 0 if it holds no counter
+        """
+        counter = self._counters.get(value)
+        return counter[0] if counter is not None else 0
+
+    def top(self, k: int = None) -> list:
+        """
+        return up to k (value, estimate, error) tuples, most frequent first. The true count of each value
+        lies between estimate - error and estimate
+        """
+        items = sorted(self._items(), key=lambda pair: pair[1][0], reverse=True)
+        if k is not None:
+            items = items[:k]
+        return [(value, counter[0], counter[1]) for value, counter in items]
+
+
+def top_k(values, k: int, capacity: int = None, epsilon: float = None) -> list:
+    """
+    return the k most frequent values of an iterable as (value, estimate, error) tuples, reading it once.
+    Memory is bounded by capacity counters (default 10 * k), or by 1 / epsilon counters when epsilon is given
+    """
+    if epsilon is not None:
+        summary = SpaceSaving.with_error(epsilon)
+    else:
+        summary = SpaceSaving(capacity if capacity is not None else 10 * k)
+    summary.update(values)
+    return summary.top(k)
+
+
+def find_mode_approx(values, capacity: int = 1000) -> (DynamicArray, int):
+    """
+    return a tuple like hash_map_sc.find_mode holding the values with the highest estimated count and that
+    estimate. Exact whenever the stream has at most capacity distinct values
+    """
+    summary = SpaceSaving(capacity)
+    summary.update(values)
+    maxKey = DynamicArray()
+    maxVal = 0
+    for value, estimate, error in summary.top():
+        if estimate < maxVal:
+            break
+        maxVal = estimate
+        maxKey.append(value)
+    return maxKey, maxVal
@@ -2,6 +2,8 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+from bisect import bisect_left
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -100,11 +102,15 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # no per-node __dict__, a map holds one node per entry
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """Initialize node given a key, value and the cached hash of the key."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -116,6 +122,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,6 +149,8 @@ class LinkedList:
     Supported methods are: insert, remove, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -165,35 +175,42 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash: int = None) -> SLNode:
+        """Insert new node at front of the list and return it."""
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
+        return self._head
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If hash is given, nodes with a different cached hash are skipped
+        without comparing keys.
         Return True if removal was successful, False otherwise.
         """
+        return self.pop(key, hash) is not None
+
+    def pop(self, key: str, hash: int = None) -> SLNode:
+        """Remove first node with matching key and return it, or None if no match"""
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
                 self._size -= 1
-                return True
+                return node
 
             previous, node = node, node.next
-        return False
+        return None
 
-    def contains(self, key: str) -> SLNode:
+    def contains(self, key: str, hash: int = None) -> SLNode:
         """Return node with matching key, or None if no match"""
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -203,15 +220,81 @@ class LinkedList:
         return self._size
 
 
+class SortedArrayBucket:
+    """
+    Bucket that keeps its nodes in an array sorted by (hash, key), so lookups
+    are a binary search instead of a scan. Used in place of a LinkedList once
+    a chain grows long; supports the same insert, remove, contains, length
+    and iterator methods
+    """
+
+    __slots__ = ('_nodes', '_order')
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize the bucket from an iterable of nodes."""
+        self._nodes = sorted(nodes, key=lambda node: (node.hash, node.key))
+        self._order = [(node.hash, node.key) for node in self._nodes]
+        for node in self._nodes:
+            node.next = None
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SAB [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes in (hash, key) order."""
+        return iter(self._nodes)
+
+    def insert(self, key: str, value: object, hash: int = None) -> SLNode:
+        """Insert new node at its sorted position and return it."""
+        index = bisect_left(self._order, (hash, key))
+        node = SLNode(key, value, None, hash)
+        self._order.insert(index, (hash, key))
+        self._nodes.insert(index, node)
+        return node
+
+    def remove(self, key: str, hash: int = None) -> bool:
+        """
+        Remove node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        return self.pop(key, hash) is not None
+
+    def pop(self, key: str, hash: int = None) -> SLNode:
+        """Remove node with matching key and return it, or None if no match"""
+        index = bisect_left(self._order, (hash, key))
+        if index < len(self._order) and self._order[index] == (hash, key):
+            del self._order[index]
+            return self._nodes.pop(index)
+        return None
+
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """Return node with matching key, or None if no match"""
+        index = bisect_left(self._order, (hash, key))
+        if index < len(self._order) and self._order[index] == (hash, key):
+            return self._nodes[index]
+        return None
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
+    # no per-entry __dict__, a map holds one entry per key
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
         """Initialize an entry for use in a hash map."""
         self.key = key
         self.value = value
 
+        # Full hash of the key, cached so probing and resizing never rehash
+        self.hash = hash
+
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
 
@@ -0,0 +1,134 @@
+# Description:  Opt-in instrumentation for the HashMaps. A MapStats object attached with HashMap.enable_stats() counts
+# puts, gets, hits, misses, removes and resizes, keeps histograms of probe lengths (open addressing) and chain lengths
+# (separate chaining), and times every resize. Listeners registered with add_listener() receive every resize and a
+# periodic snapshot, which is the hook for exporting to a metrics pipeline. A map without stats attached only pays for
+# one None check per operation.
+
+
+class MapStats:
+    """
+    Counters and histograms collected by a HashMap with stats enabled
+    """
+
+    def __init__(self, report_every: int = 0) -> None:
+        """
+        Initialize empty stats. If report_every is positive, listeners get a
+        'report' event after every report_every operations
+        """
+        self._listeners = []
+        self._reportEvery = report_every
+        self._untilReport = report_every
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters and histograms."""
+        self.puts = 0
+        self.gets = 0
+        self.hits = 0
+        self.misses = 0
+        self.removes = 0
+        self.resizes = 0
+        self.resize_seconds = 0.0
+        self.last_resize_seconds = 0.0
+
+        # length -> number of operations that visited that many buckets / chain nodes
+        self.probe_lengths = {}
+        self.chain_lengths = {}
+
+    # ------------------------- listeners ------------------------- #
+
+    def add_listener(self, callback) -> None:
+        """
+        Register callback(event, data). event is 'resize' with the resize
+        details, or 'report' with a snapshot()
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        """Unregister a callback added with add_listener."""
+        self._listeners.remove(callback)
+
+    def _notify(self, event: str, data: dict) -> None:
+        """Call every listener with an event."""
+        for callback in self._listeners:
+            callback(event, data)
+
+    def _tick(self) -> None:
+        """Count one operation towards the next periodic report."""
+        if self._reportEvery:
+            self._untilReport -= 1
+            if self._untilReport <= 0:
+                self._untilReport = self._reportEvery
+                self._notify('report', self.snapshot())
+
+    # ------------------------- recording ------------------------- #
+
+    def _record_length(self, length: int, probe: bool) -> None:
+        """Add one sample to the probe or chain length histogram."""
+        histogram = self.probe_lengths if probe else self.chain_lengths
+        histogram[length] = histogram.get(length, 0) + 1
+
+    def record_put(self, length: int, probe: bool = True) -> None:
+        """Record a put that visited length buckets (probe) or chain nodes."""
+        self.puts += 1
+        self._record_length(length, probe)
+        self._tick()
+
+    def record_get(self, hit: bool, length: int, probe: bool = True) -> None:
+        """Record a get or contains_key lookup."""
+        self.gets += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._record_length(length, probe)
+        self._tick()
+
+    def record_remove(self, length: int, probe: bool = True) -> None:
+        """Record a remove."""
+        self.removes += 1
+        self._record_length(length, probe)
+        self._tick()
+
+    def record_resize(self, seconds: float, old_capacity: int, new_capacity: int) -> None:
+        """Record a resize_table that took the given time."""
+        self.resizes += 1
+        self.resize_seconds += seconds
+        self.last_resize_seconds = seconds
+        self._notify('resize', {'seconds': seconds, 'old_capacity': old_capacity, 'new_capacity': new_capacity})
+
+    # -------------------------- queries -------------------------- #
+
+    @staticmethod
+    def _average(histogram: dict) -> float:
+        """Mean of a length histogram."""
+        count = sum(histogram.values())
+        if count == 0:
+            return 0.0
+        return sum(length * times for length, times in histogram.items()) / count
+
+    def average_probe_length(self) -> float:
+        """Mean number of buckets visited per open addressing operation."""
+        return self._average(self.probe_lengths)
+
+    def average_chain_length(self) -> float:
+        """Mean chain length seen per separate chaining operation."""
+        return self._average(self.chain_lengths)
+
+    def snapshot(self) -> dict:
+        """Return all counters and histograms as a plain dictionary."""
+        return {
+            'puts': self.puts,
+            'gets': self.gets,
+            'hits': self.hits,
+            'misses': self.misses,
+            'removes': self.removes,
+            'resizes': self.resizes,
+            'resize_seconds': self.resize_seconds,
+            'last_resize_seconds': self.last_resize_seconds,
+            'average_probe_length': self.average_probe_length(),
+            'average_chain_length': self.average_chain_length(),
+            'probe_lengths': dict(self.probe_lengths),
+            'chain_lengths': dict(self.chain_lengths),
+        }
+